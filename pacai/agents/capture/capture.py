@@ -2,8 +2,14 @@ import abc
 
 from pacai.agents.base import BaseAgent
 from pacai.core import distanceCalculator
+from pacai.core.search import anytime
 from pacai.util import util
 
+# How long (in seconds) registerInitialState() will spend on maze distances.
+# This is well inside the startup limit from the capture rules,
+# afterwards the distances keep being computed for `timeForComputing` seconds each turn.
+DISTANCE_STARTUP_TIME = 5
+
 
 class CaptureAgent(BaseAgent):
     """
@@ -42,7 +48,10 @@ class CaptureAgent(BaseAgent):
         self.distancer = distanceCalculator.Distancer(
             gameState.getInitialLayout())
 
-        self.distancer.getMazeDistances()
+        # On small layouts this finishes right away,
+        # on large ones we fall back to Manhattan distances until it is done.
+        self.distancer.startMazeDistances()
+        self.distancer.computeMazeDistances(DISTANCE_STARTUP_TIME)
 
     def final(self, gameState):
         self.observationHistory = []
@@ -71,9 +80,16 @@ class CaptureAgent(BaseAgent):
 
         if (myPos != util.nearestPoint(myPos)):
             # We're halfway from one position to the next.
-            return gameState.getLegalActions(self.index)[0]
+            action = gameState.getLegalActions(self.index)[0]
         else:
-            return self.chooseAction(gameState)
+            action = self.chooseAction(gameState)
+
+        # Spend a slice of this turn on the maze distances (in this thread, after choosing),
+        # so computing them never slows down choosing or runs into anyone else's turn.
+        if (self.distancer is not None and not self.distancer.isReadyForMazeDistance()):
+            self.distancer.computeMazeDistances(self.timeForComputing)
+
+        return action
 
     @abc.abstractmethod
     def chooseAction(self, gameState):
@@ -88,7 +104,7 @@ class CaptureAgent(BaseAgent):
     def getFood(self, gameState):
         """
         Returns the food you're meant to eat.
-        This is in the form of a `pacai.core.grid.Grid`
+        This is in the form of a read-only `pacai.core.grid.GridView`
         where `m[x][y] = True` if there is food you can eat (based on your team) in that square.
         """
 
@@ -100,7 +116,7 @@ class CaptureAgent(BaseAgent):
     def getFoodYouAreDefending(self, gameState):
         """
         Returns the food you're meant to protect (i.e., that your opponent is supposed to eat).
-        This is in the form of a `pacai.core.grid.Grid`
+        This is in the form of a read-only `pacai.core.grid.GridView`
         where `m[x][y] = True` if there is food at (x, y) that your opponent can eat.
         """
 
@@ -191,3 +207,16 @@ class CaptureAgent(BaseAgent):
             return None
 
         return self.observationHistory[-1]
+
+    def searchPath(self, problem, heuristic = None, timeLimit = anytime.DEFAULT_TIME_LIMIT):
+        """
+        Find a path for a search problem (e.g. a `pacai.core.search.position.PositionSearchProblem`
+        starting at this agent's position) within `timeLimit` seconds,
+        using `pacai.core.search.anytime.anytimeAStarSearch`.
+
+        The default time limit is well inside the time allowed for a move.
+        Returns the best path found in time (which may not be the cheapest path),
+        or None if no path was found in time.
+        """
+
+        return anytime.anytimeAStarSearch(problem, heuristic, timeLimit = timeLimit)
@@ -13,12 +13,19 @@ class ReflexCaptureAgent(CaptureAgent):
     def __init__(self, index, **kwargs):
         super().__init__(index)
 
+        # The (state, {action: successor}) that chooseAction() expanded all at once.
+        self._successors = None
+
     def chooseAction(self, gameState):
         """
         Picks among the actions with the highest return from `ReflexCaptureAgent.evaluate`.
         """
 
-        actions = gameState.getLegalActions(self.index)
+        # Expand every action at once, `ReflexCaptureAgent.getSuccessor` will use these.
+        successors = gameState.generateSuccessors(self.index)
+        self._successors = (gameState, dict(successors))
+
+        actions = [action for (action, successor) in successors]
 
         start = time.time()
         values = [self.evaluate(gameState, a) for a in actions]
@@ -34,7 +41,11 @@ class ReflexCaptureAgent(CaptureAgent):
         Finds the next successor which is a grid position (location tuple).
         """
 
-        successor = gameState.generateSuccessor(self.index, action)
+        if (self._successors is not None and self._successors[0] is gameState):
+            successor = self._successors[1][action]
+        else:
+            successor = gameState.generateSuccessor(self.index, action)
+
         pos = successor.getAgentState(self.index).getPosition()
 
         if (pos != util.nearestPoint(pos)):
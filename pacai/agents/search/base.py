@@ -19,9 +19,21 @@ class SearchAgent(BaseAgent):
             fn = 'pacai.student.search.depthFirstSearch',
             prob = 'pacai.core.search.position.PositionSearchProblem',
             heuristic = 'pacai.core.search.heuristic.null',
+            maxNodes = None, maxMemory = None, timeLimit = None,
             **kwargs):
         super().__init__(index)
 
+        # Limits that are passed to the search function (if it takes them).
+        self._searchLimits = {}
+        if (maxNodes is not None):
+            self._searchLimits['maxNodes'] = int(maxNodes)
+
+        if (maxMemory is not None):
+            self._searchLimits['maxMemory'] = int(maxMemory)
+
+        if (timeLimit is not None):
+            self._searchLimits['timeLimit'] = float(timeLimit)
+
         # Get the search problem type from the name.
         self.searchType = reflection.qualifiedImport(prob)
         logging.info('[SearchAgent] using problem type %s.' % (prob))
@@ -53,12 +65,17 @@ class SearchAgent(BaseAgent):
         self._actions = self.searchFunction(problem)  # Find a path.
         self._actionIndex = 0
 
-        totalCost = problem.actionsCost(self._actions)
-
         state.setHighlightLocations(problem.getVisitHistory())
 
-        logging.info('Path found with total cost of %d in %.1f seconds' %
-                (totalCost, time.time() - starttime))
+        # Searches with limits (see the constructor) give up by returning None.
+        if (self._actions is None):
+            logging.warning('No path found within the search limits %s in %.1f seconds, stopping.'
+                    % (str(self._searchLimits), time.time() - starttime))
+            self._actions = []
+        else:
+            totalCost = problem.actionsCost(self._actions)
+            logging.info('Path found with total cost of %d in %.1f seconds' %
+                    (totalCost, time.time() - starttime))
 
         logging.info('Search nodes expanded: %d' % problem.getExpandedCount())
 
@@ -81,15 +98,26 @@ class SearchAgent(BaseAgent):
         Get the specified search function by name.
         If that function also takes a heurisitc (i.e. has a parameter called "heuristic"),
         then return a lambda that binds the heuristic to the function.
+        Any search limits (maxNodes, maxMemory, and timeLimit) given to the agent are also bound.
         """
 
         # Locate the function.
         function = reflection.qualifiedImport(functionName)
 
+        # Any limits must be parameters of the function.
+        limits = self._searchLimits
+        for name in limits:
+            if (name not in function.__code__.co_varnames):
+                raise ValueError('Search function %s does not take %s.' % (functionName, name))
+
         # Check if the function has a heuristic.
         if 'heuristic' not in function.__code__.co_varnames:
             logging.info('[SearchAgent] using function %s.' % (functionName))
-            return function
+
+            if (len(limits) == 0):
+                return function
+
+            return lambda x: function(x, **limits)
 
         # Fetch the heuristic.
         heuristic = reflection.qualifiedImport(heuristicName)
@@ -97,4 +125,4 @@ class SearchAgent(BaseAgent):
                 (functionName, heuristicName))
 
         # Bind the heuristic.
-        return lambda x: function(x, heuristic = heuristic)
+        return lambda x: function(x, heuristic = heuristic, **limits)
@@ -13,11 +13,13 @@ import sys
 
 from pacai.agents import keyboard
 from pacai.bin.arguments import getParser
+from pacai.core import distanceCalculator
 from pacai.core.actions import Actions
 from pacai.core.distance import manhattan
 from pacai.core.game import Game
 from pacai.core.gamestate import AbstractGameState
 from pacai.core.grid import Grid
+from pacai.core.grid import GridView
 from pacai.core.layout import Layout
 from pacai.core.layout import getLayout
 from pacai.ui.capture.null import CaptureNullView
@@ -80,6 +82,14 @@ class CaptureGameState(AbstractGameState):
         self._redFood = Grid(self._food.getWidth(), self._food.getHeight(), initialValue = False)
         self._blueFood = Grid(self._food.getWidth(), self._food.getHeight(), initialValue = False)
 
+        # Read-only views of each side's food, shared with successors until food is eaten.
+        self._redFoodView = None
+        self._blueFoodView = None
+
+        # Keep a running count of each side's food so the rules never need to count a grid.
+        self._redFoodCount = 0
+        self._blueFoodCount = 0
+
         for x in range(self._food.getWidth()):
             for y in range(self._food.getHeight()):
                 if (not self._food[x][y]):
@@ -87,8 +97,10 @@ class CaptureGameState(AbstractGameState):
 
                 if (self.isOnRedSide((x, y))):
                     self._redFood[x][y] = True
+                    self._redFoodCount += 1
                 else:
                     self._blueFood[x][y] = True
+                    self._blueFoodCount += 1
 
     # Override
     def generateSuccessor(self, agentIndex, action):
@@ -123,16 +135,17 @@ class CaptureGameState(AbstractGameState):
 
     # Override
     def eatFood(self, x, y):
-        if (not self._foodCopied):
-            self._redFood = self._redFood.copy()
-            self._blueFood = self._blueFood.copy()
-
-        super().eatFood(x, y)
+        if (not super().eatFood(x, y)):
+            return False
 
         if (self.isOnRedSide((x, y))):
-            self._redFood[x][y] = False
+            self._getMutableSideFood(True)[x][y] = False
+            self._redFoodCount -= 1
         else:
-            self._blueFood[x][y] = False
+            self._getMutableSideFood(False)[x][y] = False
+            self._blueFoodCount -= 1
+
+        return True
 
     def getBlueCapsules(self):
         """
@@ -147,10 +160,23 @@ class CaptureGameState(AbstractGameState):
         Returns a grid of food that corresponds to the food on the blue team's side.
         For the grid g, g[x][y] = True if there is food in (x, y) that belongs to
         blue (meaning blue is protecting it, red is trying to eat it).
-        The caller should not modify the grid.
+
+        The grid is a read-only `pacai.core.grid.GridView` that shares storage with this state,
+        and its asList() only scans the grid once for each configuration of food.
         """
 
-        return self._blueFood
+        if (self._blueFoodView is None):
+            self._blueFoodView = GridView(self._blueFood)
+
+        return self._blueFoodView
+
+    def getBlueFoodCount(self):
+        """
+        Get the amount of food left on the blue side.
+        This is much faster than counting the grid from `CaptureGameState.getBlueFood`.
+        """
+
+        return self._blueFoodCount
 
     def getBlueTeamIndices(self):
         """
@@ -173,10 +199,23 @@ class CaptureGameState(AbstractGameState):
         Returns a grid of food that corresponds to the food on the red team's side.
         For the grid g, g[x][y] = True if there is food in (x, y) that belongs to
         red (meaning red is protecting it, blue is trying to eat it).
-        The caller should not modify the grid.
+
+        The grid is a read-only `pacai.core.grid.GridView` that shares storage with this state,
+        and its asList() only scans the grid once for each configuration of food.
         """
 
-        return self._redFood
+        if (self._redFoodView is None):
+            self._redFoodView = GridView(self._redFood)
+
+        return self._redFoodView
+
+    def getRedFoodCount(self):
+        """
+        Get the amount of food left on the red side.
+        This is much faster than counting the grid from `CaptureGameState.getRedFood`.
+        """
+
+        return self._redFoodCount
 
     def getRedTeamIndices(self):
         """
@@ -216,6 +255,13 @@ class CaptureGameState(AbstractGameState):
 
         return position[0] < int(self._layout.width / 2)
 
+    # Override
+    def undo(self):
+        super().undo()
+
+        # Every action takes one unit of time (see _applySuccessorAction()).
+        self._timeleft += 1
+
     def isOnRedTeam(self, agentIndex):
         """
         Returns true if the agent with the given agentIndex is on the red team.
@@ -223,21 +269,83 @@ class CaptureGameState(AbstractGameState):
 
         return self._teams[agentIndex]
 
-    def _applySuccessorAction(self, agentIndex, action):
+    def _applySuccessorAction(self, agentIndex, action, legalActions = None):
         """
         Apply the action to the context state (self).
         """
 
+        # Time passes first, so undo() can always give it back (even if the action fails).
+        self._timeleft -= 1
+
         # Find appropriate rules for the agent.
-        AgentRules.applyAction(self, action, agentIndex)
+        AgentRules.applyAction(self, action, agentIndex, legalActions)
         AgentRules.checkDeath(self, agentIndex)
-        AgentRules.decrementTimer(self.getAgentState(agentIndex))
+        AgentRules.decrementTimer(self.getMutableAgentState(agentIndex))
 
         # Book keeping.
         self._lastAgentMoved = agentIndex
-        self._timeleft -= 1
 
-        self._hash = None
+    # Override
+    def _getMutableFood(self):
+        # Each side's food is owned (and copied on write) along with the full grid of food.
+        if (not self._foodCopied):
+            self._redFood = self._redFood.copy()
+            self._blueFood = self._blueFood.copy()
+            self._redFoodView = None
+            self._blueFoodView = None
+
+        return super()._getMutableFood()
+
+    def _getMutableSideFood(self, isRed):
+        """
+        Get one side's food grid so that it can be modified (after calling _getMutableFood()).
+        The grid is copied first if a view of it was handed out.
+        """
+
+        if (isRed):
+            if (self._redFoodView is not None):
+                self._redFood = self._redFood.copy()
+                self._redFoodView = None
+
+            return self._redFood
+
+        if (self._blueFoodView is not None):
+            self._blueFood = self._blueFood.copy()
+            self._blueFoodView = None
+
+        return self._blueFood
+
+    # Override
+    def _restoreCapsule(self, x, y, index):
+        if (not self._capsulesCopied):
+            self._redCapsules = self._redCapsules.copy()
+            self._blueCapsules = self._blueCapsules.copy()
+
+        super()._restoreCapsule(x, y, index)
+
+        isRed = self.isOnRedSide((x, y))
+        sideCapsules = self._redCapsules if isRed else self._blueCapsules
+
+        # Each side's capsules are kept in the same order as all the capsules.
+        sideIndex = 0
+        for capsule in self._capsules[:index]:
+            if (self.isOnRedSide(capsule) == isRed):
+                sideIndex += 1
+
+        sideCapsules.insert(sideIndex, (x, y))
+
+    # Override
+    def _restoreFood(self, x, y):
+        super()._restoreFood(x, y)
+
+        if (self.isOnRedSide((x, y))):
+            self._redFoodView = None
+            self._getMutableSideFood(True)[x][y] = True
+            self._redFoodCount += 1
+        else:
+            self._blueFoodView = None
+            self._getMutableSideFood(False)[x][y] = True
+            self._blueFoodCount += 1
 
 class CaptureRules:
     """
@@ -254,8 +362,8 @@ class CaptureRules:
         game.state = initState
         game.length = length
 
-        self._totalBlueFood = initState.getBlueFood().count()
-        self._totalRedFood = initState.getRedFood().count()
+        self._totalBlueFood = initState.getBlueFoodCount()
+        self._totalRedFood = initState.getRedFoodCount()
 
         return game
 
@@ -278,10 +386,10 @@ class CaptureRules:
         redWin = False
         blueWin = False
 
-        if (state.getRedFood().count() <= MIN_FOOD):
+        if (state.getRedFoodCount() <= MIN_FOOD):
             logging.info("The Blue team ate all but %d of the opponents' dots." % MIN_FOOD)
             blueWin = True
-        elif (state.getBlueFood().count() <= MIN_FOOD):
+        elif (state.getBlueFoodCount() <= MIN_FOOD):
             logging.info("The Red team ate all but %d of the opponents' dots." % MIN_FOOD)
             redWin = True
         else:
@@ -341,20 +449,24 @@ class AgentRules:
         """
 
         agentState = state.getAgentState(agentIndex)
-        return Actions.getPossibleActions(agentState.getPosition(), agentState.getDirection(),
-                state.getWalls())
+        return state.getInitialLayout().getPossibleActions(agentState.getPosition(),
+                agentState.getDirection())
 
     @staticmethod
-    def applyAction(state, action, agentIndex):
+    def applyAction(state, action, agentIndex, legalActions = None):
         """
         Edits the state to reflect the results of the action.
+        If the legal actions for the state are already known, they can be passed in.
         """
 
-        legal = AgentRules.getLegalActions(state, agentIndex)
+        legal = legalActions
+        if (legal is None):
+            legal = AgentRules.getLegalActions(state, agentIndex)
+
         if (action not in legal):
             raise ValueError('Illegal action: ' + str(action))
 
-        agentState = state.getAgentState(agentIndex)
+        agentState = state.getMutableAgentState(agentIndex)
 
         # Update position.
         vector = Actions.directionToVector(action, AgentRules.AGENT_SPEED)
@@ -391,8 +503,8 @@ class AgentRules:
             else:
                 state.addScore(-FOOD_POINTS)
 
-            if ((isRed and state.getBlueFood().count() <= MIN_FOOD)
-                    or (not isRed and state.getRedFood().count() <= MIN_FOOD)):
+            if ((isRed and state.getBlueFoodCount() <= MIN_FOOD)
+                    or (not isRed and state.getRedFoodCount() <= MIN_FOOD)):
                 state.endGame(True)
 
             return
@@ -413,7 +525,7 @@ class AgentRules:
                 otherTeam = state.getRedTeamIndices()
 
             for agentIndex in otherTeam:
-                state.getAgentState(agentIndex).setScaredTimer(SCARED_TIME)
+                state.getMutableAgentState(agentIndex).setScaredTimer(SCARED_TIME)
 
     @staticmethod
     def decrementTimer(agentState):
@@ -454,9 +566,10 @@ class AgentRules:
             # Otherwise, we are being eatten.
             if (agentState.isBraveGhost() or otherAgentState.isScaredGhost()):
                 state.addScore(teamPointModifier * KILL_POINTS)
-                otherAgentState.respawn()
+                state.getMutableAgentState(otherAgentIndex).respawn()
             else:
                 state.addScore(teamPointModifier * -KILL_POINTS)
+                agentState = state.getMutableAgentState(agentIndex)
                 agentState.respawn()
 
 #############################
@@ -518,6 +631,12 @@ def readCommand(argv):
             help = 'comma separated arguments to be passed to blue team (e.g. \'opt1=val1,opt2\') '
                 + '(default: %(default)s)')
 
+    parser.add_argument('--distance-cache', dest = 'distanceCache',
+            action = 'store', type = str, default = None,
+            help = 'save maze distance tables to (and map them from) this directory, '
+                + 'so they are only computed once per layout and shared between processes '
+                + '(default: %(default)s)')
+
     parser.add_argument('--keys0', dest = 'keys0',
             action = 'store_true', default = False,
             help = 'make agent 0 (first red player) a keyboard agent (default: %(default)s)')
@@ -558,6 +677,9 @@ def readCommand(argv):
     elif options.debug:
         updateLoggingLevel(logging.DEBUG)
 
+    if (options.distanceCache is not None):
+        distanceCalculator.setCacheDir(options.distanceCache)
+
     viewOptions = {
         'gifFPS': options.gifFPS,
         'gifPath': options.gif,
@@ -118,23 +118,23 @@ class PacmanGameState(AbstractGameState):
 
         return self._agentStates[PACMAN_AGENT_INDEX]
 
-    def _applySuccessorAction(self, agentIndex, action):
+    def _applySuccessorAction(self, agentIndex, action, legalActions = None):
         """
         Apply the action to the context state (self).
         """
 
         # Let the agent's logic deal with its action's effects on the board.
         if (agentIndex == PACMAN_AGENT_INDEX):
-            PacmanRules.applyAction(self, action)
+            PacmanRules.applyAction(self, action, legalActions)
         else:
-            GhostRules.applyAction(self, action, agentIndex)
+            GhostRules.applyAction(self, action, agentIndex, legalActions)
 
         # Time passes.
         if (agentIndex == PACMAN_AGENT_INDEX):
             # Penalty for waiting around.
             self.addScore(-TIME_PENALTY)
         else:
-            GhostRules.decrementTimer(self.getAgentState(agentIndex))
+            GhostRules.decrementTimer(self.getMutableAgentState(agentIndex))
 
         # Resolve multi-agent effects.
         GhostRules.checkDeath(self, agentIndex)
@@ -142,8 +142,6 @@ class PacmanGameState(AbstractGameState):
         # Book keeping.
         self._lastAgentMoved = agentIndex
 
-        self._hash = None
-
 class ClassicGameRules(object):
     """
     These game rules manage the control flow of a game, deciding when
@@ -217,20 +215,24 @@ class PacmanRules:
         """
 
         agentState = state.getPacmanState()
-        return Actions.getPossibleActions(agentState.getPosition(), agentState.getDirection(),
-                state.getWalls())
+        return state.getInitialLayout().getPossibleActions(agentState.getPosition(),
+                agentState.getDirection())
 
     @staticmethod
-    def applyAction(state, action):
+    def applyAction(state, action, legalActions = None):
         """
         Edits the state to reflect the results of the action.
+        If the legal actions for the state are already known, they can be passed in.
         """
 
-        legal = PacmanRules.getLegalActions(state)
+        legal = legalActions
+        if (legal is None):
+            legal = PacmanRules.getLegalActions(state)
+
         if (action not in legal):
             raise ValueError('Illegal pacman action: ' + str(action))
 
-        pacmanState = state.getPacmanState()
+        pacmanState = state.getMutableAgentState(PACMAN_AGENT_INDEX)
 
         # Update position.
         vector = Actions.directionToVector(action, PacmanRules.PACMAN_SPEED)
@@ -260,8 +262,8 @@ class PacmanRules:
             state.eatCapsule(x, y)
 
             # Reset all ghosts' scared timers.
-            for ghostState in state.getGhostStates():
-                ghostState.setScaredTimer(SCARED_TIME)
+            for index in state.getGhostIndexes():
+                state.getMutableAgentState(index).setScaredTimer(SCARED_TIME)
 
 class GhostRules:
     """
@@ -278,8 +280,8 @@ class GhostRules:
         """
 
         agentState = state.getGhostState(ghostIndex)
-        possibleActions = Actions.getPossibleActions(agentState.getPosition(),
-                agentState.getDirection(), state.getWalls())
+        possibleActions = state.getInitialLayout().getPossibleActions(agentState.getPosition(),
+                agentState.getDirection())
         reverse = Actions.reverseDirection(agentState.getDirection())
 
         if (Directions.STOP in possibleActions):
@@ -291,12 +293,15 @@ class GhostRules:
         return possibleActions
 
     @staticmethod
-    def applyAction(state, action, ghostIndex):
-        legal = GhostRules.getLegalActions(state, ghostIndex)
+    def applyAction(state, action, ghostIndex, legalActions = None):
+        legal = legalActions
+        if (legal is None):
+            legal = GhostRules.getLegalActions(state, ghostIndex)
+
         if (action not in legal):
             raise ValueError('Illegal ghost action: ' + str(action))
 
-        ghostState = state.getGhostState(ghostIndex)
+        ghostState = state.getMutableAgentState(ghostIndex)
         speed = GhostRules.GHOST_SPEED
         if (ghostState.isScared()):
             speed /= 2.0
@@ -341,7 +346,7 @@ class GhostRules:
         if (ghostState.isScared()):
             # Pacman ate a ghost.
             state.addScore(GHOST_POINTS)
-            ghostState.respawn()
+            state.getMutableAgentState(agentIndex).respawn()
         elif (not state.isOver()):
             # A ghost ate pacman.
             state.addScore(LOSE_POINTS)
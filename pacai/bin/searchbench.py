@@ -0,0 +1,378 @@
+"""
+Benchmark the search functions and heuristics on the bundled search layouts.
+
+Every search (and heuristic) that makes sense for a layout's problem is run on it:
+ - `*Maze` layouts use a `pacai.core.search.position.PositionSearchProblem`.
+ - `*Search` layouts use a `pacai.core.search.food.FoodSearchProblem`.
+ - `*Corners` layouts use a `pacai.student.searchAgents.CornersProblem`.
+
+For each run we record the wall time, path cost, nodes expanded, peak frontier size,
+and peak memory (with tracemalloc, in a separate run so it does not skew the time).
+Searches with a time limit (anytime) also record whether they ran into it (`deadline`),
+since then their path (and its cost) depends on how fast the machine is.
+Results can be written as JSON, and compared against a previous (baseline) result file.
+"""
+
+import argparse
+import fnmatch
+import json
+import logging
+import os
+import sys
+import textwrap
+import time
+import tracemalloc
+
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.layout import DEFAULT_LAYOUT_DIR
+from pacai.core.layout import getLayout
+from pacai.core.search import anytime
+from pacai.core.search import bidirectional
+from pacai.core.search import engine
+from pacai.core.search import heuristic
+from pacai.core.search import jumpPoint
+from pacai.core.search import memoryBounded
+from pacai.core.search.food import FoodSearchProblem
+from pacai.core.search.position import PositionSearchProblem
+from pacai.student import searchAgents
+from pacai.util.logs import initLogging
+from pacai.util.logs import updateLoggingLevel
+
+RESULTS_VERSION = 1
+
+DEFAULT_MAX_NODES = 20000
+DEFAULT_TOLERANCE = 0.25
+
+# Times this small are mostly noise, so they are never reported as regressions.
+MIN_COMPARED_TIME = 0.05
+
+# Seconds for the anytime search, enough to improve its first path on the bigger layouts.
+ANYTIME_TIME_LIMIT = 5.0
+
+# Layout name pattern -> (problem name, problem class).
+PROBLEMS = [
+    ('*Maze', 'position', PositionSearchProblem),
+    ('*Search', 'food', FoodSearchProblem),
+    ('*Corners', 'corners', searchAgents.CornersProblem),
+]
+
+# Search name -> (search function, whether it takes a heuristic, problem names or None for all,
+# other keyword arguments for the search).
+SEARCHES = {
+    'bfs': (engine.breadthFirstSearch, False, None, {}),
+    'dfs': (engine.depthFirstSearch, False, None, {}),
+    'ucs': (engine.uniformCostSearch, False, None, {}),
+    'astar': (engine.aStarSearch, True, None, {}),
+    'biucs': (bidirectional.bidirectionalUniformCostSearch, False, ['position'], {}),
+    'biastar': (bidirectional.bidirectionalAStarSearch, True, ['position'], {}),
+    'idastar': (memoryBounded.iterativeDeepeningAStarSearch, True, None, {}),
+    'smastar': (memoryBounded.memoryBoundedAStarSearch, True, None, {}),
+    'jps': (jumpPoint.jumpPointSearch, False, ['position'], {}),
+    'anytime': (anytime.anytimeAStarSearch, True, None, {'timeLimit': ANYTIME_TIME_LIMIT}),
+}
+
+# Problem name -> {heuristic name: heuristic}.
+HEURISTICS = {
+    'position': {
+        'manhattan': heuristic.manhattan,
+        'euclidean': heuristic.euclidean,
+    },
+    'food': {
+        'numFood': heuristic.numFood,
+        'foodMST': heuristic.foodMST,
+        'foodHeuristic': searchAgents.foodHeuristic,
+    },
+    'corners': {
+        'cornersHeuristic': searchAgents.cornersHeuristic,
+    },
+}
+
+# The fields that identify a benchmark (the rest are measurements).
+KEY_FIELDS = ('layout', 'problem', 'search', 'heuristic')
+
+def compareResults(results, baseline, tolerance = DEFAULT_TOLERANCE):
+    """
+    Compare results against baseline results.
+    Returns a list of regressions (as human-readable strings).
+
+    A benchmark regresses if it no longer finds a path, finds a more expensive path,
+    expands more nodes, or takes more time/memory/frontier than the tolerance allows.
+    The cost and nodes expanded are not compared for runs that hit their time limit.
+    """
+
+    baselineByKey = {_getKey(result): result for result in baseline}
+    regressions = []
+
+    for result in results:
+        key = _getKey(result)
+        if (key not in baselineByKey):
+            continue
+
+        old = baselineByKey[key]
+        name = '/'.join([str(value) for value in key if value is not None])
+
+        if (old['status'] == 'ok' and result['status'] != 'ok'):
+            regressions.append('%s: status went from ok to %s' % (name, result['status']))
+            continue
+
+        if (result['status'] != 'ok'):
+            continue
+
+        # Out of time, the path found depends on how fast the machine is.
+        if (not (result.get('deadline') or old.get('deadline'))):
+            if (result['cost'] > old['cost']):
+                regressions.append('%s: cost went from %s to %s' %
+                        (name, old['cost'], result['cost']))
+
+            if (result['expanded'] > old['expanded']):
+                regressions.append('%s: nodes expanded went from %d to %d' %
+                        (name, old['expanded'], result['expanded']))
+
+        for field in ('time', 'peakFrontier', 'peakMemory'):
+            if (result.get(field) is None or old.get(field) is None):
+                continue
+
+            if (field == 'time' and max(result[field], old[field]) < MIN_COMPARED_TIME):
+                continue
+
+            if (result[field] > old[field] * (1.0 + tolerance)):
+                regressions.append('%s: %s went from %s to %s' %
+                        (name, field, old[field], result[field]))
+
+    return regressions
+
+def getBenchmarks(layoutPattern = '*', searchPattern = '*'):
+    """
+    Get all the (layout name, problem name, problem class, search name, heuristic name)
+    benchmarks that match the given patterns.
+    """
+
+    layouts = sorted([os.path.splitext(filename)[0]
+            for filename in os.listdir(DEFAULT_LAYOUT_DIR) if filename.endswith('.lay')])
+
+    benchmarks = []
+    for layoutName in layouts:
+        if (not fnmatch.fnmatch(layoutName, layoutPattern)):
+            continue
+
+        for (pattern, problemName, problemClass) in PROBLEMS:
+            if (not fnmatch.fnmatch(layoutName, pattern)):
+                continue
+
+            for (searchName, (function, usesHeuristic, problems, options)) in sorted(
+                    SEARCHES.items()):
+                if (not fnmatch.fnmatch(searchName, searchPattern)):
+                    continue
+
+                if (problems is not None and problemName not in problems):
+                    continue
+
+                heuristicNames = [None]
+                if (usesHeuristic):
+                    heuristicNames = sorted(HEURISTICS[problemName].keys())
+
+                for heuristicName in heuristicNames:
+                    benchmarks.append((layoutName, problemName, problemClass,
+                            searchName, heuristicName))
+
+    return benchmarks
+
+def runBenchmark(layoutName, problemName, problemClass, searchName, heuristicName,
+        maxNodes = DEFAULT_MAX_NODES, measureMemory = True, timeLimit = None):
+    """
+    Run a single benchmark and return its result (a dict).
+    A non-None `timeLimit` replaces the time limit of searches that have one.
+    """
+
+    result = {
+        'layout': layoutName,
+        'problem': problemName,
+        'search': searchName,
+        'heuristic': heuristicName,
+    }
+
+    state = PacmanGameState(getLayout(layoutName))
+
+    try:
+        problem, actions, elapsed = _search(state, problemClass, searchName, heuristicName,
+                maxNodes, timeLimit)
+    except Exception as ex:
+        logging.warning('Benchmark %s failed: %s' % (str(result), ex))
+        result['status'] = 'error'
+        return result
+
+    timeLimit = _getOptions(searchName, timeLimit).get('timeLimit')
+    if (timeLimit is not None):
+        result['deadline'] = (elapsed >= timeLimit)
+
+    if (actions is None):
+        if (result.get('deadline')):
+            result['status'] = 'deadline'
+        elif (problem.getExpandedCount() >= maxNodes):
+            result['status'] = 'budget'
+        else:
+            result['status'] = 'failed'
+    else:
+        result['status'] = 'ok'
+        result['cost'] = problem.actionsCost(actions)
+
+    result['time'] = round(elapsed, 4)
+    result['expanded'] = problem.getExpandedCount()
+    result['peakFrontier'] = problem.getPeakFrontierSize()
+
+    result['peakMemory'] = None
+    if (measureMemory):
+        tracemalloc.start()
+        try:
+            _search(state, problemClass, searchName, heuristicName, maxNodes, timeLimit)
+            result['peakMemory'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return result
+
+def _formatResult(result):
+    text = '%-18s %-8s %-7s %-16s %-7s' % (result['layout'], result['problem'], result['search'],
+            result['heuristic'] or '', result['status'])
+
+    for field in ('cost', 'expanded', 'peakFrontier', 'time', 'peakMemory'):
+        text += ' %s: %-8s' % (field, result.get(field, ''))
+
+    if (result.get('deadline')):
+        text += ' (deadline)'
+
+    return text.rstrip()
+
+def _getKey(result):
+    return tuple([result.get(field) for field in KEY_FIELDS])
+
+def _getOptions(searchName, timeLimit):
+    options = dict(SEARCHES[searchName][3])
+    if (timeLimit is not None and 'timeLimit' in options):
+        options['timeLimit'] = timeLimit
+
+    return options
+
+def _search(state, problemClass, searchName, heuristicName, maxNodes, timeLimit = None):
+    problem = problemClass(state)
+    function, usesHeuristic, problems, _ = SEARCHES[searchName]
+    options = _getOptions(searchName, timeLimit)
+
+    startTime = time.time()
+    if (usesHeuristic):
+        problemName = [name for (pattern, name, cls) in PROBLEMS if cls is problemClass][0]
+        actions = function(problem, HEURISTICS[problemName][heuristicName], maxNodes = maxNodes,
+                **options)
+    else:
+        actions = function(problem, maxNodes = maxNodes, **options)
+
+    return problem, actions, time.time() - startTime
+
+def parseOptions(argv):
+    """
+    Processes the command used to run the search benchmarks from the command line.
+    """
+
+    description = """
+    DESCRIPTION:
+        This program benchmarks the search functions and heuristics
+        on the bundled maze, search, and corners layouts.
+
+    EXAMPLES:
+        (1) python -m pacai.bin.searchbench
+            - Run all the benchmarks and print the results.
+        (2) python -m pacai.bin.searchbench --output baseline.json
+            - Run all the benchmarks and save the results.
+        (3) python -m pacai.bin.searchbench --baseline baseline.json --layouts '*Maze'
+            - Run the maze benchmarks and check them against saved results.
+    """
+
+    parser = argparse.ArgumentParser(description = textwrap.dedent(description),
+        prog = os.path.basename(__file__), formatter_class = argparse.RawTextHelpFormatter)
+
+    parser.add_argument('-b', '--baseline', dest = 'baseline',
+            action = 'store', type = str, default = None,
+            help = 'compare against the results in this file (default: %(default)s)')
+
+    parser.add_argument('-l', '--layouts', dest = 'layouts',
+            action = 'store', type = str, default = '*',
+            help = 'only benchmark layouts that match this pattern (default: %(default)s)')
+
+    parser.add_argument('-o', '--output', dest = 'output',
+            action = 'store', type = str, default = None,
+            help = 'write the results (as JSON) to this file (default: %(default)s)')
+
+    parser.add_argument('-q', '--quiet', dest = 'quiet',
+            action = 'store_true', default = False,
+            help = 'set logging level to warning (default: %(default)s)')
+
+    parser.add_argument('--max-nodes', dest = 'maxNodes',
+            action = 'store', type = int, default = DEFAULT_MAX_NODES,
+            help = 'give up on a search after expanding this many nodes (default: %(default)s)')
+
+    parser.add_argument('--no-memory', dest = 'measureMemory',
+            action = 'store_false', default = True,
+            help = 'skip measuring peak memory (which runs every search twice)')
+
+    parser.add_argument('--searches', dest = 'searches',
+            action = 'store', type = str, default = '*',
+            help = 'only run searches that match this pattern (default: %(default)s)')
+
+    parser.add_argument('--time-limit', dest = 'timeLimit',
+            action = 'store', type = float, default = None,
+            help = 'seconds to give searches that have a time limit (default: %s)'
+                % (ANYTIME_TIME_LIMIT))
+
+    parser.add_argument('--tolerance', dest = 'tolerance',
+            action = 'store', type = float, default = DEFAULT_TOLERANCE,
+            help = 'allowed relative increase in time/memory/frontier over the baseline '
+                + '(default: %(default)s)')
+
+    options, otherjunk = parser.parse_known_args(argv)
+
+    if len(otherjunk) != 0:
+        raise ValueError('Unrecognized options: \'%s\'.' % (str(otherjunk)))
+
+    if options.quiet:
+        updateLoggingLevel(logging.WARNING)
+
+    return options
+
+def main(argv):
+    """
+    Entry point for the search benchmarks.
+    The args are a blind pass of `sys.argv` with the executable stripped.
+    Returns the number of regressions against the baseline (if any).
+    """
+
+    initLogging()
+
+    opts = parseOptions(argv)
+
+    results = []
+    for benchmark in getBenchmarks(opts.layouts, opts.searches):
+        result = runBenchmark(*benchmark, maxNodes = opts.maxNodes,
+                measureMemory = opts.measureMemory, timeLimit = opts.timeLimit)
+        results.append(result)
+
+        logging.info(_formatResult(result))
+
+    if (opts.output is not None):
+        with open(opts.output, 'w') as file:
+            json.dump({'version': RESULTS_VERSION, 'results': results}, file, indent = 4)
+
+    if (opts.baseline is None):
+        return 0
+
+    with open(opts.baseline, 'r') as file:
+        baseline = json.load(file)['results']
+
+    regressions = compareResults(results, baseline, opts.tolerance)
+    for regression in regressions:
+        logging.warning('Regression: %s' % (regression))
+
+    logging.info('%d regression(s) against %s.' % (len(regressions), opts.baseline))
+    return len(regressions)
+
+if __name__ == '__main__':
+    sys.exit(1 if main(sys.argv[1:]) > 0 else 0)
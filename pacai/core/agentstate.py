@@ -9,13 +9,17 @@ class AgentState:
     The convention for positions, like a graph, is that (0, 0) is the lower left corner,
     x increases horizontally and y increases vertically.
     Therefore, north is the direction of increasing y, or (0, 1).
+
+    Agent states are slotted (they have no per-instance `__dict__`),
+    since games and agents may hold on to a very large number of them.
     """
 
+    __slots__ = ('_start', '_position', '_direction', '_isPacman', '_scaredTimer', '_hash')
+
     def __init__(self, position, direction, isPacman):
-        # Save the starting information for later use.
-        self._startPosition = position
-        self._startDirection = direction
-        self._startIsPacman = isPacman
+        # Save the starting information (position, direction, isPacman) for later use.
+        # This never changes, so copies can all share the same tuple.
+        self._start = (position, direction, isPacman)
 
         self._position = position
         self._direction = direction
@@ -23,18 +27,26 @@ class AgentState:
         self._isPacman = isPacman
         self._scaredTimer = 0
 
+        # Keep a copy of the hash, since game states hash their agents every time they are hashed.
+        # Any modification must clear the hash.
+        self._hash = None
+
     def copy(self):
-        state = AgentState(self._startPosition, self._startDirection, self._startIsPacman)
+        # Skip __init__, every field is about to be set.
+        state = AgentState.__new__(AgentState)
 
+        state._start = self._start
         state._isPacman = self._isPacman
         state._position = self._position
         state._direction = self._direction
         state._scaredTimer = self._scaredTimer
+        state._hash = self._hash
 
         return state
 
     def decrementScaredTimer(self):
         self._scaredTimer = max(0, self._scaredTimer - 1)
+        self._hash = None
 
     def getDirection(self):
         return self._direction
@@ -69,9 +81,19 @@ class AgentState:
 
     def setIsPacman(self, isPacman):
         self._isPacman = isPacman
+        self._hash = None
 
     def setScaredTimer(self, timer):
         self._scaredTimer = timer
+        self._hash = None
+
+    def snapshot(self):
+        """
+        Get the values of everything that can change about this agent,
+        so they can be put back later with restore().
+        """
+
+        return (self._position, self._direction, self._isPacman, self._scaredTimer, self._hash)
 
     def snapToNearestPoint(self):
         """
@@ -79,16 +101,23 @@ class AgentState:
         """
 
         self._position = util.nearestPoint(self._position)
+        self._hash = None
 
     def respawn(self):
         """
         This agent was killed, respawn it at the start as a pacman.
         """
 
-        self._position = self._startPosition
-        self._direction = self._startDirection
-        self._isPacman = self._startIsPacman
+        self._position, self._direction, self._isPacman = self._start
         self._scaredTimer = 0
+        self._hash = None
+
+    def restore(self, snapshot):
+        """
+        Put back the values from an earlier call to snapshot().
+        """
+
+        self._position, self._direction, self._isPacman, self._scaredTimer, self._hash = snapshot
 
     def updatePosition(self, vector):
         """
@@ -105,6 +134,8 @@ class AgentState:
             # If this is a zero vector, face the same direction as before.
             self._direction = direction
 
+        self._hash = None
+
     def __eq__(self, other):
         if (other is None):
             return False
@@ -115,7 +146,11 @@ class AgentState:
                 and self._scaredTimer == other._scaredTimer)
 
     def __hash__(self):
-        return util.buildHash(self._position, self._direction, self._isPacman, self._scaredTimer)
+        if (self._hash is None):
+            self._hash = util.buildHash(self._position, self._direction, self._isPacman,
+                    self._scaredTimer)
+
+        return self._hash
 
     def __str__(self):
         typeString = 'Ghost'
@@ -127,4 +162,4 @@ class AgentState:
             scaredString = '!'
 
         return "%s%s: Position: %s, Direction: %s" % (typeString, scaredString,
-                str(self._position), str(self.direction))
+                str(self._position), str(self._direction))
@@ -1,10 +1,39 @@
+import array
+import collections
+import hashlib
+import logging
+import mmap
+import os
+import struct
 import sys
+import tempfile
+import threading
+import time
 
 from pacai.core.distance import manhattan
-from pacai.util import priorityQueue
 
 DEFAULT_DISTANCE = 10000
 
+# The default number of source cells a lazy distancer keeps.
+DEFAULT_LAZY_ROWS = 1024
+
+# The most distance tables kept in this process' cache (the least recently used are dropped).
+# Games only use a layout or two, but generated (e.g. RANDOM) layouts are new every game.
+DISTANCE_CACHE_SIZE = 8
+
+# On-disk distance tables are named after the fingerprint of the walls they were computed for.
+CACHE_FILE_EXTENSION = '.dist'
+
+# Header: magic, format version, array typecode, width, height, number of open cells,
+# and padding so the matrix is aligned when the file is memory-mapped.
+CACHE_FILE_MAGIC = b'PACD'
+CACHE_FILE_VERSION = 2
+CACHE_HEADER_FORMAT = '<4sBcHHI2x'
+
+# Distances are stored as unsigned ints, the max value is reserved for unreachable cells.
+UNREACHABLE_SHORT = 0xFFFF
+UNREACHABLE_INT = 0xFFFFFFFF
+
 class Distancer(object):
     """
     A class for computing and caching the shortest path between any two points in a given maze.
@@ -14,13 +43,64 @@ class Distancer(object):
     distancer = Distancer(gameState.getInitialLayout())
     distancer.getDistance((1, 1), (10, 10))
     ```
+
+    On very large layouts, a lazy distancer only computes (and caches)
+    the distances from the cells that are actually queried:
+    ```
+    distancer = Distancer(gameState.getInitialLayout(), lazy = True, maxRows = 256)
+    ```
     """
 
-    def __init__(self, layout):
+    def __init__(self, layout, lazy = False, maxRows = DEFAULT_LAZY_ROWS, maxBytes = None):
+        """
+        Args:
+            layout: The layout to compute distances for.
+            lazy: Compute distances one source cell at a time (see `LazyDistanceTable`)
+                instead of all at once.
+            maxRows: The most source cells a lazy distancer will keep cached (None for no limit).
+            maxBytes: The most memory a lazy distancer will use for its cache (None for no limit).
+        """
+
         self._distances = None
         self.dc = DistanceCalculator(layout, self)
 
+        self._lazy = lazy
+        self._maxRows = maxRows
+        self._maxBytes = maxBytes
+
+    def attachMazeDistances(self, path):
+        """
+        Use the distances in a file written by
+        `pacai.core.distanceCalculator.saveDistances` (or by a cache directory),
+        mapped read-only into memory so it can be shared with other processes.
+        Returns False (and leaves this distancer alone) if the file cannot be used.
+        """
+
+        distances = attachDistances(path, self.dc.layout.walls)
+        if (distances is None):
+            return False
+
+        self._distances = distances
+        return True
+
+    def computeMazeDistances(self, seconds = None):
+        """
+        Work on distances started with `Distancer.startMazeDistances` in the calling thread,
+        for (about) this many seconds (None for until they are done).
+        Returns True if the distances are done.
+        """
+
+        if (isinstance(self._distances, BackgroundDistanceTable)):
+            self._distances.compute(seconds)
+
+        return self.isReadyForMazeDistance()
+
     def getMazeDistances(self):
+        if (self._lazy):
+            self._distances = LazyDistanceTable(self.dc.layout.walls,
+                    maxRows = self._maxRows, maxBytes = self._maxBytes)
+            return
+
         self.dc.run()
 
     def getDistance(self, pos1, pos2):
@@ -31,6 +111,10 @@ class Distancer(object):
         if (self._distances is None):
             return manhattan(pos1, pos2)
 
+        if (isinstance(self._distances, BackgroundDistanceTable)
+                and self._distances.isComplete()):
+            self._distances = self._distances.getMatrix()
+
         if isInt(pos1) and isInt(pos2):
             return self.getDistanceOnGrid(pos1, pos2)
 
@@ -48,15 +132,64 @@ class Distancer(object):
         return bestDistance
 
     def getDistanceOnGrid(self, pos1, pos2):
-        key = (pos1, pos2)
-        if key in self._distances:
-            return self._distances[key]
+        return self._distances.getDistance(pos1, pos2)
+
+    def getStats(self):
+        """
+        Get the cache statistics for a lazy distancer (see LazyDistanceTable.getStats()),
+        or None if this distancer is not lazy (or has no distances yet).
+        """
 
-        raise Exception("Position not in grid: " + str(key))
+        if (not isinstance(self._distances, LazyDistanceTable)):
+            return None
+
+        return self._distances.getStats()
 
     def isReadyForMazeDistance(self):
+        """
+        Check if all distances are exact (instead of Manhattan approximations).
+        """
+
+        if (isinstance(self._distances, BackgroundDistanceTable)):
+            return self._distances.isComplete()
+
         return (self._distances is not None)
 
+    def startMazeDistances(self, timeLimit = 0):
+        """
+        Start computing the maze distances one row at a time (see `BackgroundDistanceTable`).
+        Until they are done, getDistance() is exact for the rows that are finished
+        and falls back to Manhattan distance for the rest.
+
+        Args:
+            timeLimit: How many seconds a background thread may compute for.
+                None lets it run until the distances are done.
+                With no time, nothing is computed until `Distancer.computeMazeDistances` is called.
+        """
+
+        if (self._lazy):
+            self.getMazeDistances()
+            return
+
+        table = getBackgroundTable(self.dc.layout.walls)
+        if (table is None):
+            self._distances = getCachedDistances(self.dc.layout.walls)
+            return
+
+        self._distances = table
+        table.addTime(timeLimit)
+
+    def waitForMazeDistances(self, timeout = None):
+        """
+        Block until a background computation is done (or the timeout passes).
+        Returns True if the distances are done.
+        """
+
+        if (isinstance(self._distances, BackgroundDistanceTable)):
+            self._distances.wait(timeout)
+
+        return self.isReadyForMazeDistance()
+
 def isInt(pos):
     x, y = pos
     return x == int(x) and y == int(y)
@@ -78,76 +211,741 @@ def getGrids1D(x):
 # MACHINERY FOR COMPUTING MAZE DISTANCES #
 ##########################################
 
-distanceMap = {}
+# Distance tables shared by every distancer in this process, keyed by the walls' fingerprint.
+# This is an LRU cache of (at most) DISTANCE_CACHE_SIZE tables.
+_distanceCache = collections.OrderedDict()
+
+# If set, distance tables are also saved to (and loaded from) this directory.
+_cacheDir = None
+
+# Distance tables that are still being filled in by a background thread, keyed like _distanceCache.
+# Tables are dropped when they complete, and this is an LRU of (at most) DISTANCE_CACHE_SIZE tables.
+_backgroundTables = collections.OrderedDict()
 
 class DistanceCalculator:
     def __init__(self, layout, distancer):
         self.layout = layout
         self.distancer = distancer
-        self.cache = {}
 
     def run(self):
-        if self.layout.walls not in self.cache:
-            self.cache[self.layout.walls] = computeDistances(self.layout)
-
-        self.distancer._distances = self.cache[self.layout.walls]
+        self.distancer._distances = getDistances(self.layout)
 
-def computeDistances(layout):
+def setCacheDir(path):
     """
-    Runs UCS to all other positions from each position.
+    Save computed distance tables to (and look for them in) the given directory.
+    Tables are keyed by the content of the walls,
+    so any game on the same layout (in any process) can reuse them.
+    Pass None to only cache in memory.
     """
 
-    distances = {}
-    allNodes = layout.walls.asList(False)
+    global _cacheDir
+    _cacheDir = path
 
-    for source in allNodes:
-        dist = {}
-        closed = {}
+def getCacheDir():
+    return _cacheDir
 
-        for node in allNodes:
-            dist[node] = sys.maxsize
+def wallsFingerprint(walls):
+    """
+    Get a string that uniquely identifies a wall configuration.
+    """
 
-        queue = priorityQueue.PriorityQueue()
-        queue.push(source, 0)
-        dist[source] = 0
+    content = '%d,%d,%s' % (walls.getWidth(), walls.getHeight(), str(walls))
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
 
-        while not queue.isEmpty():
-            node = queue.pop()
-            if node in closed:
-                continue
+def getDistances(layout):
+    """
+    Get the all-pairs distances for a layout,
+    first from this process' cache, then from the cache directory (if set),
+    and only then by computing them.
+    """
 
-            closed[node] = True
-            nodeDist = dist[node]
-            adjacent = []
-            x, y = node
+    distances = getCachedDistances(layout.walls)
+    if (distances is None):
+        distances = computeDistances(layout)
+        _storeDistances(layout.walls, distances)
 
-            if not layout.isWall((x, y + 1)):
-                adjacent.append((x, y + 1))
+    return distances
 
-            if not layout.isWall((x, y - 1)):
-                adjacent.append((x, y - 1))
+def getCachedDistances(walls):
+    """
+    Get the all-pairs distances for some walls from this process' cache
+    or the cache directory (if set).
+    Returns None if the distances have not been computed yet.
+    """
 
-            if not layout.isWall((x + 1, y)):
-                adjacent.append((x + 1, y))
+    fingerprint = wallsFingerprint(walls)
 
-            if not layout.isWall((x - 1, y)):
-                adjacent.append((x - 1, y))
+    if (fingerprint in _distanceCache):
+        _distanceCache.move_to_end(fingerprint)
+        return _distanceCache[fingerprint]
 
-            for other in adjacent:
-                if other not in dist:
-                    continue
+    if (_cacheDir is None):
+        return None
 
-                oldDist = dist[other]
-                newDist = nodeDist + 1
-                if newDist < oldDist:
-                    dist[other] = newDist
-                    queue.push(other, newDist)
+    path = os.path.join(_cacheDir, fingerprint + CACHE_FILE_EXTENSION)
+    if (not os.path.isfile(path)):
+        return None
 
-        for target in allNodes:
-            distances[(target, source)] = dist[target]
+    distances = attachDistances(path, walls)
+    if (distances is not None):
+        _cacheDistances(fingerprint, distances)
 
     return distances
 
+def _cacheDistances(fingerprint, distances):
+    _distanceCache[fingerprint] = distances
+    _distanceCache.move_to_end(fingerprint)
+
+    while (len(_distanceCache) > DISTANCE_CACHE_SIZE):
+        _distanceCache.popitem(last = False)
+
+def _storeDistances(walls, distances):
+    """
+    Put freshly computed distances in this process' cache and the cache directory (if set).
+    When saved, the cached copy is the file mapped into memory (so it can be shared).
+    """
+
+    fingerprint = wallsFingerprint(walls)
+
+    if (_cacheDir is not None):
+        path = os.path.join(_cacheDir, fingerprint + CACHE_FILE_EXTENSION)
+        if (saveDistances(path, walls, distances)):
+            distances = attachDistances(path, walls) or distances
+
+    _cacheDistances(fingerprint, distances)
+
+def saveDistances(path, walls, distances):
+    """
+    Write a `DistanceMatrix` to disk in a compact binary form:
+    a small header followed by the raw matrix.
+    The file is written to a temp file and then moved into place,
+    so concurrent readers never see a partial table.
+    Returns True if the table was saved.
+    """
+
+    matrix = distances.getArray()
+    if (not isinstance(matrix, array.array)):
+        matrix = array.array(matrix.format, matrix)
+
+    if (sys.byteorder != 'little'):
+        matrix = array.array(matrix.typecode, matrix)
+        matrix.byteswap()
+
+    header = struct.pack(CACHE_HEADER_FORMAT, CACHE_FILE_MAGIC, CACHE_FILE_VERSION,
+            matrix.typecode.encode('ascii'), walls.getWidth(), walls.getHeight(),
+            distances.getNumCells())
+
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok = True)
+
+        handle, tempPath = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(path)))
+        with os.fdopen(handle, 'wb') as file:
+            file.write(header)
+            matrix.tofile(file)
+
+        # Temp files are private by default, but other processes may need to read this one.
+        os.chmod(tempPath, 0o644)
+        os.replace(tempPath, path)
+    except OSError as ex:
+        logging.warning('Unable to save distance table to %s: %s' % (path, ex))
+        return False
+
+    return True
+
+def loadDistances(path, walls):
+    """
+    Read a `DistanceMatrix` written by saveDistances().
+    Returns None if the file does not match the walls (or is not a distance table).
+    """
+
+    numCells = walls.count(False)
+
+    try:
+        with open(path, 'rb') as file:
+            typecode = _readHeader(file, walls)
+
+            matrix = array.array(typecode)
+            matrix.fromfile(file, numCells * numCells)
+    except (OSError, EOFError, ValueError, struct.error) as ex:
+        logging.warning('Ignoring distance table at %s: %s' % (path, ex))
+        return None
+
+    if (sys.byteorder != 'little'):
+        matrix.byteswap()
+
+    return DistanceMatrix(walls, matrix)
+
+def attachDistances(path, walls):
+    """
+    Get a read-only `DistanceMatrix` that is memory-mapped straight from a file
+    written by saveDistances(), instead of being read into memory.
+    Every process (and distancer) that attaches the same file shares
+    a single physical copy of it through the OS page cache.
+    Returns None if the file does not match the walls (or is not a distance table).
+    """
+
+    # The file is little-endian, so it can only be used in place on little-endian machines.
+    if (sys.byteorder != 'little'):
+        return loadDistances(path, walls)
+
+    numCells = walls.count(False)
+    headerSize = struct.calcsize(CACHE_HEADER_FORMAT)
+
+    try:
+        with open(path, 'rb') as file:
+            typecode = _readHeader(file, walls)
+
+            size = headerSize + array.array(typecode).itemsize * numCells * numCells
+            if (os.fstat(file.fileno()).st_size < size):
+                raise ValueError('Truncated distance table.')
+
+            # The map stays valid after the file is closed,
+            # and it is kept alive by the view into it.
+            buffer = mmap.mmap(file.fileno(), size, access = mmap.ACCESS_READ)
+    except (OSError, ValueError, struct.error) as ex:
+        logging.warning('Ignoring distance table at %s: %s' % (path, ex))
+        return None
+
+    matrix = memoryview(buffer)[headerSize:size].cast(typecode)
+    return DistanceMatrix(walls, matrix)
+
+def _readHeader(file, walls):
+    """
+    Read and check the header of a distance table file.
+    Returns the typecode of the matrix that follows it.
+    """
+
+    headerSize = struct.calcsize(CACHE_HEADER_FORMAT)
+
+    header = file.read(headerSize)
+    if (len(header) != headerSize):
+        raise ValueError('Truncated header.')
+
+    magic, version, typecode, width, height, numCells = struct.unpack(
+        CACHE_HEADER_FORMAT, header)
+    typecode = typecode.decode('ascii')
+
+    if (magic != CACHE_FILE_MAGIC or version != CACHE_FILE_VERSION):
+        raise ValueError('Not a distance table.')
+
+    if (width != walls.getWidth() or height != walls.getHeight()
+            or numCells != walls.count(False) or typecode != _getStorageType(numCells)[0]):
+        raise ValueError('Distance table is for different walls.')
+
+    return typecode
+
+class DistanceMatrix(object):
+    """
+    The maze distances between every pair of open cells in a layout.
+
+    Each open cell gets a dense integer id (its index in walls.asList(False)),
+    and the distances are kept in a single flat array of unsigned ints
+    (row-major, indexed by [sourceId * numCells + targetId]).
+    This is far smaller than a dict keyed by pairs of positions.
+
+    Lookups by a pair of positions (`matrix[(pos1, pos2)]`) are also supported.
+    Unreachable pairs have a distance of sys.maxsize.
+    """
+
+    def __init__(self, walls, matrix = None):
+        """
+        Args:
+            walls: The walls the distances are for.
+            matrix: Already computed distances, either an array (e.g. loaded from disk)
+                or a read-only memoryview (see attachDistances()).
+                If not supplied, the distances will be computed with a BFS from every cell.
+        """
+
+        self._cells = walls.asList(False)
+        self._ids = {cell: id for (id, cell) in enumerate(self._cells)}
+        self._numCells = len(self._cells)
+        self._unreachable = _getStorageType(self._numCells)[1]
+
+        if (matrix is None):
+            matrix = self._computeMatrix()
+
+        self._matrix = matrix
+
+    def getArray(self):
+        """
+        Get the raw distance array (or read-only memoryview).
+        The caller should not modify the array.
+        """
+
+        return self._matrix
+
+    def getCellId(self, position):
+        """
+        Get the id of an open cell, or None if the position is not an open cell.
+        """
+
+        return self._ids.get(position)
+
+    def getCells(self):
+        """
+        Get the open cells (in order of their id).
+        The caller should not modify the list.
+        """
+
+        return self._cells
+
+    def getDistance(self, pos1, pos2):
+        id1 = self._ids.get(pos1)
+        id2 = self._ids.get(pos2)
+
+        if (id1 is None or id2 is None):
+            raise Exception("Position not in grid: " + str((pos1, pos2)))
+
+        return self.getDistanceById(id1, id2)
+
+    def getDistanceById(self, id1, id2):
+        distance = self._matrix[id1 * self._numCells + id2]
+        if (distance == self._unreachable):
+            return sys.maxsize
+
+        return distance
+
+    def getNumCells(self):
+        return self._numCells
+
+    def _computeMatrix(self):
+        """
+        Run a unit-cost BFS from every open cell.
+        """
+
+        neighbors = _buildNeighbors(self._cells, self._ids)
+        emptyRow = _emptyRow(self._numCells)
+
+        matrix = array.array(emptyRow.typecode)
+        for source in range(self._numCells):
+            matrix.extend(_bfsRow(source, neighbors, emptyRow))
+
+        return matrix
+
+    def __contains__(self, key):
+        pos1, pos2 = key
+        return pos1 in self._ids and pos2 in self._ids
+
+    def __eq__(self, other):
+        if (not isinstance(other, DistanceMatrix)):
+            return False
+
+        return self._cells == other._cells and self._matrix == other._matrix
+
+    def __getitem__(self, key):
+        pos1, pos2 = key
+        return self.getDistance(pos1, pos2)
+
+class LazyDistanceTable(object):
+    """
+    Maze distances that are computed one source cell at a time, only when asked for.
+
+    Each queried source gets a single BFS row (the distance to every other cell),
+    and rows are kept in a least-recently-used cache bounded by a number of rows and/or bytes.
+    Since the maze is undirected, a cached row for either end of a query can answer it.
+
+    This supports the same lookups as `DistanceMatrix`,
+    but never needs the full (numCells ** 2) table in memory.
+    """
+
+    def __init__(self, walls, maxRows = None, maxBytes = None):
+        """
+        Args:
+            walls: The walls the distances are for.
+            maxRows: The most rows to keep cached (None for no limit).
+            maxBytes: The most bytes of rows to keep cached (None for no limit).
+        """
+
+        self._cells = walls.asList(False)
+        self._ids = {cell: id for (id, cell) in enumerate(self._cells)}
+        self._numCells = len(self._cells)
+        self._unreachable = _getStorageType(self._numCells)[1]
+
+        self._neighbors = _buildNeighbors(self._cells, self._ids)
+        self._emptyRow = _emptyRow(self._numCells)
+
+        rowBytes = max(1, self._emptyRow.itemsize * self._numCells)
+        self._maxRows = maxRows
+        if (maxBytes is not None):
+            byteRows = max(1, maxBytes // rowBytes)
+            if (self._maxRows is None or byteRows < self._maxRows):
+                self._maxRows = byteRows
+
+        self._rows = collections.OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def clear(self):
+        """
+        Drop all the cached rows (the statistics are kept).
+        """
+
+        self._rows.clear()
+
+    def getCellId(self, position):
+        return self._ids.get(position)
+
+    def getCells(self):
+        return self._cells
+
+    def getDistance(self, pos1, pos2):
+        id1 = self._ids.get(pos1)
+        id2 = self._ids.get(pos2)
+
+        if (id1 is None or id2 is None):
+            raise Exception("Position not in grid: " + str((pos1, pos2)))
+
+        return self.getDistanceById(id1, id2)
+
+    def getDistanceById(self, id1, id2):
+        if (id1 not in self._rows and id2 in self._rows):
+            id1, id2 = id2, id1
+
+        distance = self.getRow(id1)[id2]
+        if (distance == self._unreachable):
+            return sys.maxsize
+
+        return distance
+
+    def getNumCells(self):
+        return self._numCells
+
+    def getRow(self, id):
+        """
+        Get the distances from the cell with the given id to every other cell (by id),
+        computing them if necessary.
+        The caller should not modify the row.
+        """
+
+        row = self._rows.get(id)
+        if (row is not None):
+            self._hits += 1
+            self._rows.move_to_end(id)
+            return row
+
+        self._misses += 1
+        row = _bfsRow(id, self._neighbors, self._emptyRow)
+
+        self._rows[id] = row
+        while (self._maxRows is not None and len(self._rows) > self._maxRows):
+            self._rows.popitem(last = False)
+            self._evictions += 1
+
+        return row
+
+    def getStats(self):
+        """
+        Get the cache statistics:
+        hits, misses (rows computed), evictions, rows (currently cached), and bytes (used by rows).
+        """
+
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'rows': len(self._rows),
+            'bytes': len(self._rows) * self._emptyRow.itemsize * self._numCells,
+        }
+
+    def __contains__(self, key):
+        pos1, pos2 = key
+        return pos1 in self._ids and pos2 in self._ids
+
+    def __getitem__(self, key):
+        pos1, pos2 = key
+        return self.getDistance(pos1, pos2)
+
+class BackgroundDistanceTable(object):
+    """
+    All-pairs maze distances that are filled in one source row at a time by a background thread.
+
+    Rows can be computed by a background thread (see `BackgroundDistanceTable.addTime`),
+    which only runs while it has compute time left.
+    Or they can be computed in the calling thread for a slice of time
+    (see `BackgroundDistanceTable.compute`),
+    so an agent can spend a fixed part of its own turn on them
+    without a thread competing with (or running into) anyone else's turn.
+
+    Lookups are exact when a row for either position is done, and Manhattan distance otherwise.
+    Once every row is done, the distances are available as a regular `DistanceMatrix`
+    (and are put in the same caches as computed distances).
+    Tables are shared by every distancer in a process, use `getBackgroundTable` to get one.
+    """
+
+    def __init__(self, walls):
+        self._walls = walls
+        self._cells = walls.asList(False)
+        self._ids = {cell: id for (id, cell) in enumerate(self._cells)}
+        self._numCells = len(self._cells)
+        self._unreachable = _getStorageType(self._numCells)[1]
+
+        self._neighbors = _buildNeighbors(self._cells, self._ids)
+        self._emptyRow = _emptyRow(self._numCells)
+
+        self._rows = [None] * self._numCells
+        self._matrix = None
+
+        # The next row that nobody has started, and the number of rows that are done.
+        self._nextRow = 0
+        self._numRows = 0
+
+        self._budget = 0.0
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def addTime(self, seconds = None):
+        """
+        Let the background thread compute for (up to) this many more seconds.
+        None lets the thread run until the table is complete.
+        The thread is started on the first call with any time.
+        """
+
+        with self._condition:
+            if (seconds is None):
+                self._budget = float('inf')
+            else:
+                self._budget += seconds
+
+            self._condition.notify_all()
+
+            if (self._thread is None and self._budget > 0 and not self.isComplete()):
+                self._thread = threading.Thread(target = self._run, daemon = True,
+                        name = 'distance-table')
+                self._thread.start()
+
+    def compute(self, seconds = None):
+        """
+        Compute rows in the calling thread until the table is complete
+        or this many seconds have passed (None for until it is complete).
+        The time is checked before each row, so this can run over by (at most) one row.
+        Returns True if the table is complete.
+        """
+
+        deadline = float('inf')
+        if (seconds is not None):
+            deadline = time.time() + seconds
+
+        while (time.time() < deadline and self._computeRow()):
+            pass
+
+        return self.isComplete()
+
+    def getDistance(self, pos1, pos2):
+        id1 = self._ids.get(pos1)
+        id2 = self._ids.get(pos2)
+
+        if (id1 is None or id2 is None):
+            raise Exception("Position not in grid: " + str((pos1, pos2)))
+
+        # The rows are dropped (after the matrix is set) when the table completes.
+        rows = self._rows
+        if (rows is None):
+            return self._matrix.getDistanceById(id1, id2)
+
+        row = rows[id1]
+        if (row is None):
+            row = rows[id2]
+            id2 = id1
+
+        if (row is None):
+            return manhattan(pos1, pos2)
+
+        distance = row[id2]
+        if (distance == self._unreachable):
+            return sys.maxsize
+
+        return distance
+
+    def getMatrix(self):
+        """
+        Get the complete distances, or None if the table is not complete yet.
+        """
+
+        return self._matrix
+
+    def getNumCells(self):
+        return self._numCells
+
+    def getNumRows(self):
+        """
+        Get the number of source rows that are done.
+        """
+
+        return self._numRows
+
+    def isComplete(self):
+        return (self._matrix is not None)
+
+    def stop(self):
+        """
+        Stop the background thread (the rows that are done are kept).
+        """
+
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def wait(self, timeout = None):
+        """
+        Block until the table is complete (or the timeout passes).
+        Returns True if the table is complete.
+        """
+
+        with self._condition:
+            self._condition.wait_for(lambda: self.isComplete() or self._stopped, timeout)
+
+        return self.isComplete()
+
+    def _finish(self):
+        matrix = array.array(self._emptyRow.typecode)
+        for row in self._rows:
+            matrix.extend(row)
+
+        self._matrix = DistanceMatrix(self._walls, matrix)
+        self._rows = None
+
+        fingerprint = wallsFingerprint(self._walls)
+        if (_backgroundTables.get(fingerprint) is self):
+            del _backgroundTables[fingerprint]
+
+        _storeDistances(self._walls, self._matrix)
+
+    def _computeRow(self):
+        """
+        Compute the next row that nobody (the background thread or a caller) has started.
+        Returns False if every row has been started.
+        """
+
+        with self._condition:
+            if (self._nextRow >= self._numCells):
+                return False
+
+            id = self._nextRow
+            self._nextRow += 1
+
+        row = _bfsRow(id, self._neighbors, self._emptyRow)
+
+        with self._condition:
+            self._rows[id] = row
+            self._numRows += 1
+
+            if (self._numRows == self._numCells):
+                self._finish()
+                self._condition.notify_all()
+
+        return True
+
+    def _run(self):
+        while (True):
+            with self._condition:
+                self._condition.wait_for(lambda: self._budget > 0 or self._stopped)
+                if (self._stopped):
+                    return
+
+            startTime = time.time()
+
+            if (not self._computeRow()):
+                return
+
+            with self._condition:
+                self._budget -= time.time() - startTime
+
+def getBackgroundTable(walls):
+    """
+    Get the (shared) background table for some walls.
+    Returns None if the complete distances are already cached
+    (see getCachedDistances()).
+    """
+
+    if (getCachedDistances(walls) is not None):
+        return None
+
+    fingerprint = wallsFingerprint(walls)
+    if (fingerprint in _backgroundTables):
+        _backgroundTables.move_to_end(fingerprint)
+        return _backgroundTables[fingerprint]
+
+    table = BackgroundDistanceTable(walls)
+    _backgroundTables[fingerprint] = table
+
+    # Evicted tables stop their thread, but anyone still holding one can keep using it.
+    while (len(_backgroundTables) > DISTANCE_CACHE_SIZE):
+        _backgroundTables.popitem(last = False)[1].stop()
+
+    return table
+
+def _buildNeighbors(cells, ids):
+    """
+    Get the ids of the open neighbors of each cell (by id).
+    """
+
+    neighbors = []
+    for (x, y) in cells:
+        neighborIds = []
+        for neighbor in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            id = ids.get(neighbor)
+            if (id is not None):
+                neighborIds.append(id)
+
+        neighbors.append(neighborIds)
+
+    return neighbors
+
+def _emptyRow(numCells):
+    """
+    Get a row of distances where every cell is unreachable.
+    """
+
+    typecode, unreachable = _getStorageType(numCells)
+    return array.array(typecode, [unreachable]) * numCells
+
+def _bfsRow(source, neighbors, emptyRow):
+    """
+    Get the distances from the source (id) to every cell with a unit-cost BFS.
+    """
+
+    unreachable = emptyRow[0]
+
+    row = array.array(emptyRow.typecode, emptyRow)
+    row[source] = 0
+
+    frontier = [source]
+    distance = 0
+    while (len(frontier) > 0):
+        distance += 1
+
+        nextFrontier = []
+        for id in frontier:
+            for neighbor in neighbors[id]:
+                if (row[neighbor] == unreachable):
+                    row[neighbor] = distance
+                    nextFrontier.append(neighbor)
+
+        frontier = nextFrontier
+
+    return row
+
+def _getStorageType(numCells):
+    """
+    Get the smallest array typecode (and its unreachable marker) that can hold
+    every distance in a layout with the given number of open cells.
+    """
+
+    if (numCells < UNREACHABLE_SHORT):
+        return 'H', UNREACHABLE_SHORT
+
+    return 'I', UNREACHABLE_INT
+
+def computeDistances(layout):
+    """
+    Compute the `DistanceMatrix` for a layout.
+    """
+
+    return DistanceMatrix(layout.walls)
+
 def getDistanceOnGrid(distances, pos1, pos2):
     key = (pos1, pos2)
     if key in distances:
@@ -5,8 +5,7 @@ Feature extractors for game states.
 import abc
 
 from pacai.core.actions import Actions
-from pacai.core.search import search
-from pacai.student.searchAgents import AnyFoodSearchProblem
+from pacai.core.nearestTarget import NearestTargetCache
 from pacai.util import counter
 
 class FeatureExtractor(abc.ABC):
@@ -37,10 +36,15 @@ class SimpleExtractor(FeatureExtractor):
     Returns simple features for a basic reflex Pacman.
     """
 
+    def __init__(self):
+        # Closest food distances, shared by every (state, action) with the same food.
+        self._nearestFood = None
+
     def getFeatures(self, state, action):
         # Extract the grid of food and wall locations and get the ghost locations.
-        food = state.getFood()
+        food = state.getFoodView()
         walls = state.getWalls()
+        layout = state.getInitialLayout()
         ghosts = state.getGhostPositions()
 
         features = counter.Counter()
@@ -54,14 +58,16 @@ class SimpleExtractor(FeatureExtractor):
 
         # Count the number of ghosts 1-step away.
         features["#-of-ghosts-1-step-away"] = sum((next_x, next_y) in
-                Actions.getLegalNeighbors(g, walls) for g in ghosts)
+                layout.getLegalNeighbors(g) for g in ghosts)
 
         # If there is no danger of ghosts then add the food feature.
-        if not features["#-of-ghosts-1-step-away"] and food[next_x][next_y]:
+        if not features["#-of-ghosts-1-step-away"] and food.get(next_x, next_y):
             features["eats-food"] = 1.0
 
-        prob = AnyFoodSearchProblem(state, start = (next_x, next_y))
-        dist = len(search.bfs(prob))
+        if (self._nearestFood is None or self._nearestFood.getWalls() is not walls):
+            self._nearestFood = NearestTargetCache(walls)
+
+        dist = self._nearestFood.distanceToNearest((next_x, next_y), state.getFoodList())
         if dist is not None:
             # Make the distance a number less than one otherwise the update will diverge wildly.
             features["closest-food"] = float(dist) / (walls.getWidth() * walls.getHeight())
@@ -1,8 +1,9 @@
 import abc
-import copy
 
+from pacai.core import zobrist
 from pacai.core.agentstate import AgentState
 from pacai.core.directions import Directions
+from pacai.core.grid import GridView
 from pacai.util import util
 
 class AbstractGameState(abc.ABC):
@@ -22,10 +23,6 @@ class AbstractGameState(abc.ABC):
 
         self._layout = layout
 
-        # Keep a copy of the hash, since it is expensive to compute.
-        # Any children should be sure to clear the hash when modifications are made.
-        self._hash = None
-
         # For food and capsules, we will only copy on write (if we eat one of them).
         # This avoid additional copies on successors that don't eat.
 
@@ -33,6 +30,10 @@ class AbstractGameState(abc.ABC):
         self._food = layout.food.copy()
         self._lastFoodEaten = None
 
+        # A read-only view of the food (see getFoodView()).
+        # Successors share the view (and its cached food list) until they eat something.
+        self._foodView = None
+
         self._capsulesCopied = False
         self._capsules = layout.capsules.copy()
         self._lastCapsuleEaten = None
@@ -45,8 +46,28 @@ class AbstractGameState(abc.ABC):
         for (isPacman, position) in layout.agentPositions:
             self._agentStates.append(AgentState(position, Directions.STOP, isPacman))
 
+        # Agent states are also copied on write (see getMutableAgentState()).
+        # This is either a list of which agent states this state owns,
+        # or None if the list of agent states itself is still shared.
+        self._agentStatesCopied = [True] * len(self._agentStates)
+
         self._score = 0
 
+        # Records for undoing actions applied in place (see applyAction()),
+        # and the record that changes are saved to while an action is being applied.
+        self._undoLog = []
+        self._undoRecord = None
+
+        # A Zobrist hash of everything except the agent states (which hash themselves).
+        # Every modification (eating, scoring, ending) updates this with a single XOR,
+        # so successors get their hash from their parent's hash instead of recomputing it.
+        self._zobristTable = zobrist.getTable(layout.width, layout.height)
+        self._zobrist = (zobrist.mix(self._layout)
+                ^ zobrist.mix(self._score)
+                ^ self._zobristTable.flags(self._gameover, self._win)
+                ^ self._zobristTable.foodGrid(self._food)
+                ^ self._zobristTable.capsules(self._capsules))
+
     @abc.abstractmethod
     def generateSuccessor(self, agentIndex, action):
         """
@@ -64,9 +85,67 @@ class AbstractGameState(abc.ABC):
 
         pass
 
+    def generateSuccessors(self, agentIndex = 0):
+        """
+        Returns a list of (action, successor) pairs for every legal action of the specified agent.
+        Each successor is the same as generateSuccessor(agentIndex, action),
+        but the legal actions are only computed (and checked) once for all of them.
+        A terminal state has no successors.
+        """
+
+        legalActions = self.getLegalActions(agentIndex)
+
+        successors = []
+        for action in legalActions:
+            successor = self._initSuccessor()
+            successor._applySuccessorAction(agentIndex, action, legalActions)
+            successors.append((action, successor))
+
+        return successors
+
     def addScore(self, score):
-        self._hash = None
-        self._score += score
+        self.setScore(self._score + score)
+
+    def applyAction(self, agentIndex, action):
+        """
+        Apply the action to this state in place, instead of creating a new successor.
+        Afterwards, this state will be equal to generateSuccessor(agentIndex, action).
+
+        Every call should be paired with a call to undo(),
+        which restores this state to exactly how it was before the action.
+        This allows searches to walk a game tree using a single state:
+        ```
+        state.applyAction(agentIndex, action)
+        value = search(state)
+        state.undo()
+        ```
+
+        Only the values an action changes are saved (see `_UndoRecord`),
+        and the agent states and food that this state owns are modified in place.
+        So agent states, food views, and lists taken from this state
+        may change when an action is applied or undone.
+        Anything shared with another state (e.g. a successor) is still copied before it is modified,
+        so the first action that touches it makes a copy that later actions can reuse.
+        """
+
+        if (self.isOver()):
+            raise RuntimeError("Can't apply actions to a terminal state.")
+
+        record = _UndoRecord(self)
+        self._undoLog.append(record)
+
+        # The rules save what they are about to change to the record
+        # (see getMutableAgentState(), eatFood(), and eatCapsule()).
+        self._undoRecord = record
+
+        try:
+            self._applySuccessorAction(agentIndex, action)
+        except Exception:
+            self._undoRecord = None
+            self.undo()
+            raise
+
+        self._undoRecord = None
 
     def eatCapsule(self, x, y):
         """
@@ -80,10 +159,15 @@ class AbstractGameState(abc.ABC):
             self._capsules = self._capsules.copy()
             self._capsulesCopied = True
 
-        self._capsules.remove((x, y))
+        index = self._capsules.index((x, y))
+        del self._capsules[index]
+
+        if (self._undoRecord is not None):
+            self._undoRecord.capsuleIndex = index
+
         self._lastCapsuleEaten = (x, y)
 
-        self._hash = None
+        self._zobrist ^= self._zobristTable.capsule(x, y)
         return True
 
     def eatFood(self, x, y):
@@ -94,21 +178,24 @@ class AbstractGameState(abc.ABC):
         if (not self.hasFood(x, y)):
             return False
 
-        if (not self._foodCopied):
-            self._food = self._food.copy()
-            self._foodCopied = True
+        self._getMutableFood()[x][y] = False
+
+        if (self._undoRecord is not None):
+            self._undoRecord.ateFood = True
 
-        self._food[x][y] = False
         self._lastFoodEaten = (x, y)
+        self._foodView = None
 
-        self._hash = None
+        self._zobrist ^= self._zobristTable.food(x, y)
         return True
 
     def endGame(self, win):
+        self._zobrist ^= self._zobristTable.flags(self._gameover, self._win)
+
         self._gameover = True
         self._win = win
 
-        self._hash = None
+        self._zobrist ^= self._zobristTable.flags(self._gameover, self._win)
 
     def getAgentPosition(self, index):
         """
@@ -125,6 +212,12 @@ class AbstractGameState(abc.ABC):
         return tuple(int(pos) for pos in position)
 
     def getAgentState(self, index):
+        """
+        Get the `pacai.core.agentstate.AgentState` for the given agent.
+        The caller should not modify the agent state,
+        since it may be shared with other game states.
+        """
+
         return self._agentStates[index]
 
     def getAgentStates(self):
@@ -144,11 +237,36 @@ class AbstractGameState(abc.ABC):
         Grids can be accessed via list notation.
         So to check if there is food at (x, y), just do something like: food[x][y].
 
-        Callers should favor hasFood() over this, since this will make a copy of the grid.
+        Callers should favor hasFood(), getFoodView(), or getFoodList() over this,
+        since this will make a copy of the grid.
         """
 
         return self._food.copy()
 
+    def getFoodList(self):
+        """
+        Returns a list of positions (x, y) of the remaining food.
+
+        The list is only computed once for each configuration of food,
+        and is shared with successors that have not eaten anything.
+        The caller should not modify the list.
+        """
+
+        return self.getFoodView().asSharedList()
+
+    def getFoodView(self):
+        """
+        Returns a read-only `pacai.core.grid.GridView` of the food.
+        This is like getFood(), but does not copy the grid.
+        Any attempt to modify the view will raise an error,
+        use copy() on the view to get a grid you can modify.
+        """
+
+        if (self._foodView is None):
+            self._foodView = GridView(self._food)
+
+        return self._foodView
+
     def getHighlightLocations(self):
         return self._highlightLocations
 
@@ -173,6 +291,30 @@ class AbstractGameState(abc.ABC):
     def getLastFoodEaten(self):
         return self._lastFoodEaten
 
+    def getMutableAgentState(self, index):
+        """
+        Get an agent state that can be modified.
+
+        Successors share agent states with the state they came from,
+        so an agent state is only copied the first time it is modified (copy on write).
+        Only game rules should need to call this, everyone else should use getAgentState().
+        """
+
+        if (self._agentStatesCopied is None):
+            self._agentStates = list(self._agentStates)
+            self._agentStatesCopied = [False] * len(self._agentStates)
+
+        if (not self._agentStatesCopied[index]):
+            self._agentStates[index] = self._agentStates[index].copy()
+            self._agentStatesCopied[index] = True
+
+        agentState = self._agentStates[index]
+
+        if (self._undoRecord is not None):
+            self._undoRecord.saveAgentState(index, agentState)
+
+        return agentState
+
     def getNumAgents(self):
         return len(self._agentStates)
 
@@ -217,7 +359,7 @@ class AbstractGameState(abc.ABC):
         Returns true if the location (x, y) has food.
         """
 
-        return self._food[x][y]
+        return self._food.get(x, y)
 
     def hasWall(self, x, y):
         """
@@ -239,8 +381,61 @@ class AbstractGameState(abc.ABC):
         self._highlightLocations = list(locations)
 
     def setScore(self, score):
+        self._zobrist ^= zobrist.mix(self._score) ^ zobrist.mix(score)
         self._score = score
-        self._hash = None
+
+    def undo(self):
+        """
+        Undo the most recent action applied with applyAction().
+        """
+
+        if (len(self._undoLog) == 0):
+            raise RuntimeError('There are no applied actions to undo.')
+
+        record = self._undoLog.pop()
+
+        for (index, snapshot) in record.agentStates:
+            self.getMutableAgentState(index).restore(snapshot)
+
+        # The last food/capsule eaten is still the one eaten by this action.
+        if (record.ateFood):
+            self._restoreFood(*self._lastFoodEaten)
+
+        if (record.capsuleIndex is not None):
+            self._restoreCapsule(*self._lastCapsuleEaten, record.capsuleIndex)
+
+        self._lastAgentMoved = record.lastAgentMoved
+        self._lastFoodEaten = record.lastFoodEaten
+        self._lastCapsuleEaten = record.lastCapsuleEaten
+        self._foodView = record.foodView
+        self._score = record.score
+        self._gameover = record.gameover
+        self._win = record.win
+        self._zobrist = record.zobrist
+
+    @abc.abstractmethod
+    def _applySuccessorAction(self, agentIndex, action, legalActions = None):
+        """
+        Apply the action to the context state (self).
+        If the legal actions of the agent are already known, they can be passed in
+        to avoid computing them again.
+        """
+
+        pass
+
+    def _getMutableFood(self):
+        """
+        Get the food grid so that it can be modified.
+        The grid is copied first if it may be seen by anyone else
+        (another state, or a view of it that was handed out).
+        """
+
+        if (not self._foodCopied or self._foodView is not None):
+            self._food = self._food.copy()
+            self._foodCopied = True
+            self._foodView = None
+
+        return self._food
 
     def _initSuccessor(self):
         """
@@ -249,18 +444,47 @@ class AbstractGameState(abc.ABC):
         """
 
         # Start with a shallow copy.
-        successor = copy.copy(self)
-        successor._hash = None
+        # This is the same as copy.copy(), but skips the generic copy machinery.
+        successor = object.__new__(type(self))
+        successor.__dict__.update(self.__dict__)
+        successor._undoLog = []
 
         # Leave food and capsules as a shallow copy, but mark them to be copied on write.
         successor._foodCopied = False
         successor._capsulesCopied = False
 
-        # Agent states need to be deep copied.
-        successor._agentStates = [agentState.copy() for agentState in self._agentStates]
+        # Share agent states, but mark them to be copied on write.
+        successor._agentStatesCopied = None
+
+        # This state now shares everything with the successor,
+        # so it also has to copy on write (instead of modifying in place in applyAction()).
+        self._foodCopied = False
+        self._capsulesCopied = False
+        self._agentStatesCopied = None
 
         return successor
 
+    def _restoreCapsule(self, x, y, index):
+        """
+        Put back a capsule that was eaten by an action that is being undone.
+        """
+
+        if (not self._capsulesCopied):
+            self._capsules = self._capsules.copy()
+            self._capsulesCopied = True
+
+        self._capsules.insert(index, (x, y))
+
+    def _restoreFood(self, x, y):
+        """
+        Put back food that was eaten by an action that is being undone.
+        """
+
+        # Views taken while the action was applied are only good until it is undone,
+        # so the food does not need to be copied for them.
+        self._foodView = None
+        self._getMutableFood()[x][y] = True
+
     def __eq__(self, other):
         if (other is None):
             return False
@@ -288,8 +512,46 @@ class AbstractGameState(abc.ABC):
                 and self._layout == other._layout)
 
     def __hash__(self):
-        if (self._hash is None):
-            self._hash = util.buildHash(self._score, self._gameover, self._win, *self._capsules,
-                self._food, *self._agentStates, self._layout)
+        # Agent states cache their own hash, so this only combines a handful of values.
+        return util.buildHash(self._zobrist, *self._agentStates)
+
+class _UndoRecord(object):
+    """
+    Everything needed to undo a single action applied with `AbstractGameState.applyAction`.
+    The simple values are saved up front,
+    and agent states and eaten food/capsules are saved by the state as they change.
+    """
+
+    __slots__ = ('lastAgentMoved', 'lastFoodEaten', 'lastCapsuleEaten', 'foodView',
+            'score', 'gameover', 'win', 'zobrist', 'ateFood', 'capsuleIndex',
+            'savedAgents', 'agentStates')
+
+    def __init__(self, state):
+        self.lastAgentMoved = state._lastAgentMoved
+        self.lastFoodEaten = state._lastFoodEaten
+        self.lastCapsuleEaten = state._lastCapsuleEaten
+        self.foodView = state._foodView
+        self.score = state._score
+        self.gameover = state._gameover
+        self.win = state._win
+        self.zobrist = state._zobrist
+
+        self.ateFood = False
+
+        # The index the eaten capsule had in the list of capsules.
+        self.capsuleIndex = None
+
+        # A bit for each agent that has been saved, and (index, snapshot) for each of them.
+        self.savedAgents = 0
+        self.agentStates = []
+
+    def saveAgentState(self, index, agentState):
+        """
+        Save an agent state that is about to be modified (unless it was already saved).
+        """
+
+        if (self.savedAgents & (1 << index)):
+            return
 
-        return self._hash
+        self.savedAgents |= (1 << index)
+        self.agentStates.append((index, agentState.snapshot()))
@@ -34,6 +34,13 @@ class Grid:
     def deepCopy(self):
         return self.copy()
 
+    def get(self, x, y):
+        """
+        Read a single cell, the same as grid[x][y].
+        """
+
+        return self._data[x][y]
+
     def getHeight(self):
         return self._height
 
@@ -55,6 +62,10 @@ class Grid:
         if (other is None):
             return False
 
+        # Let other grid types (like views) decide.
+        if (not isinstance(other, Grid)):
+            return NotImplemented
+
         return self._data == other._data
 
     def __getitem__(self, i):
@@ -82,3 +93,288 @@ class Grid:
         out = [[str(self._data[x][y])[0] for x in range(self._width)] for y in range(self._height)]
         out.reverse()
         return '\n'.join([''.join(x) for x in out])
+
+class BitGrid:
+    """
+    A 2-dimensional array of booleans backed by a single arbitrary-precision integer.
+    Cell (x, y) is stored in bit (x * height + y), which is the same cell order
+    `Grid.__hash__` uses, so a `BitGrid` hashes the same as a `Grid` with the same contents.
+
+    Data is accessed via grid[x][y] just like a `Grid`.
+    Because ints are immutable, copies are O(1) and share storage until one of them is written to.
+    Counting, equality, and hashing all work on the whole integer at once
+    instead of walking every cell.
+    """
+
+    def __init__(self, width, height, initialValue = False):
+        if (not isinstance(initialValue, bool)):
+            raise ValueError('Grids can only contain booleans')
+
+        self._width = width
+        self._height = height
+        self._mask = (1 << (width * height)) - 1
+
+        self._bits = 0
+        if (initialValue):
+            self._bits = self._mask
+
+    @staticmethod
+    def fromGrid(grid):
+        """
+        Build a `BitGrid` with the same dimensions and contents as any grid
+        that supports getWidth(), getHeight(), and grid[x][y].
+        """
+
+        if (isinstance(grid, BitGrid)):
+            return grid.copy()
+
+        bitGrid = BitGrid(grid.getWidth(), grid.getHeight())
+
+        bits = 0
+        base = 1
+        for x in range(grid.getWidth()):
+            column = grid[x]
+            for y in range(grid.getHeight()):
+                if (column[y]):
+                    bits |= base
+                base <<= 1
+
+        bitGrid._bits = bits
+        return bitGrid
+
+    def asList(self, key = True):
+        bits = self._bits
+        if (not key):
+            bits = ~bits & self._mask
+
+        values = []
+        while (bits):
+            lowBit = bits & -bits
+            index = lowBit.bit_length() - 1
+            values.append((index // self._height, index % self._height))
+            bits ^= lowBit
+
+        return values
+
+    def copy(self):
+        grid = BitGrid.__new__(BitGrid)
+        grid._width = self._width
+        grid._height = self._height
+        grid._mask = self._mask
+        grid._bits = self._bits
+        return grid
+
+    def count(self, item = True):
+        setCount = bin(self._bits).count('1')
+        if (item):
+            return setCount
+
+        return self._width * self._height - setCount
+
+    def deepCopy(self):
+        return self.copy()
+
+    def get(self, x, y):
+        """
+        Read a single cell without going through the column proxy.
+        """
+
+        return bool((self._bits >> (x * self._height + y)) & 1)
+
+    def getBits(self):
+        """
+        Get the raw integer backing this grid.
+        """
+
+        return self._bits
+
+    def getHeight(self):
+        return self._height
+
+    def getWidth(self):
+        return self._width
+
+    def set(self, x, y, value):
+        """
+        Write a single cell without going through the column proxy.
+        """
+
+        bit = 1 << (x * self._height + y)
+        if (value):
+            self._bits |= bit
+        else:
+            self._bits &= ~bit
+
+    def shallowCopy(self):
+        return self.copy()
+
+    def __eq__(self, other):
+        if (other is None):
+            return False
+
+        # Let other grid types (like views) decide.
+        if (not isinstance(other, BitGrid)):
+            return NotImplemented
+
+        return (self._bits == other._bits
+                and self._width == other._width
+                and self._height == other._height)
+
+    def __getitem__(self, x):
+        return _BitGridColumn(self, x)
+
+    def __hash__(self):
+        return hash(self._bits)
+
+    def __lt__(self, other):
+        return self.__hash__() < other.__hash__()
+
+    def __setitem__(self, x, column):
+        for y in range(self._height):
+            self.set(x, y, column[y])
+
+    def __str__(self):
+        out = [[str(self.get(x, y))[0] for x in range(self._width)] for y in range(self._height)]
+        out.reverse()
+        return '\n'.join([''.join(x) for x in out])
+
+class _BitGridColumn:
+    """
+    A lightweight view of a single column of a `BitGrid`,
+    so that grid[x][y] reads and writes work like they do on a `Grid`.
+    """
+
+    __slots__ = ('_grid', '_x')
+
+    def __init__(self, grid, x):
+        self._grid = grid
+        self._x = x
+
+    def __getitem__(self, y):
+        return self._grid.get(self._x, y)
+
+    def __iter__(self):
+        return (self._grid.get(self._x, y) for y in range(self._grid._height))
+
+    def __len__(self):
+        return self._grid._height
+
+    def __setitem__(self, y, value):
+        self._grid.set(self._x, y, value)
+
+class GridView:
+    """
+    A read-only view of a `Grid` or `BitGrid`.
+    The view shares the underlying grid's storage (no copy is made),
+    and raises a TypeError on any attempt to write through it.
+
+    Since a view is never written to, it can remember the list of True cells
+    (see `GridView.asSharedList`) and the read-only wrapper for each column.
+    Use copy() to get a regular (mutable) grid.
+    """
+
+    def __init__(self, grid):
+        self._grid = grid
+        self._list = None
+
+        # The column wrappers (made the first time each column is read).
+        self._columns = None
+
+    def asList(self, key = True):
+        """
+        Same as `Grid.asList`, a new list that the caller is free to modify.
+        The list of True cells is only computed once, and copied for each call.
+        """
+
+        if (not key):
+            return self._grid.asList(key)
+
+        return list(self.asSharedList())
+
+    def asSharedList(self):
+        """
+        Get the list of True cells without copying it.
+        The list is computed once and shared with everyone else that uses this view
+        (including game states that share the view), so the caller must not modify it.
+        """
+
+        if (self._list is None):
+            self._list = self._grid.asList()
+
+        return self._list
+
+    def copy(self):
+        return self._grid.copy()
+
+    def count(self, item = True):
+        if (item and self._list is not None):
+            return len(self._list)
+
+        return self._grid.count(item)
+
+    def deepCopy(self):
+        return self.copy()
+
+    def get(self, x, y):
+        """
+        Read a single cell, the same as view[x][y] but without going through a column.
+        """
+
+        return self._grid.get(x, y)
+
+    def getHeight(self):
+        return self._grid.getHeight()
+
+    def getWidth(self):
+        return self._grid.getWidth()
+
+    def __eq__(self, other):
+        if (isinstance(other, GridView)):
+            other = other._grid
+
+        return self._grid == other
+
+    def __getitem__(self, x):
+        if (self._columns is None):
+            self._columns = [None] * self._grid.getWidth()
+
+        column = self._columns[x]
+        if (column is None):
+            column = _ReadOnlyColumn(self._grid[x])
+            self._columns[x] = column
+
+        return column
+
+    def __hash__(self):
+        return hash(self._grid)
+
+    def __lt__(self, other):
+        return self.__hash__() < other.__hash__()
+
+    def __setitem__(self, key, item):
+        raise TypeError('Grid views are read-only, use copy() to get a grid that can be modified.')
+
+    def __str__(self):
+        return str(self._grid)
+
+class _ReadOnlyColumn:
+    """
+    A single column of a `GridView`.
+    """
+
+    __slots__ = ('_column', )
+
+    def __init__(self, column):
+        self._column = column
+
+    def __getitem__(self, y):
+        return self._column[y]
+
+    def __iter__(self):
+        return iter(self._column)
+
+    def __len__(self):
+        return len(self._column)
+
+    def __setitem__(self, y, value):
+        raise TypeError('Grid views are read-only, use copy() to get a grid that can be modified.')
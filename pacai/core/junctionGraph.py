@@ -0,0 +1,398 @@
+"""
+Compress a maze into a graph of junctions connected by corridors.
+
+Most open cells in a maze are corridor cells with exactly two open neighbors.
+Searching over those one at a time is wasted work,
+since the only thing to do in a corridor is keep going.
+A `JunctionGraph` keeps only the cells where there is a choice (or no choice at all):
+junctions (three or more neighbors) and dead ends (one or zero neighbors).
+These are the nodes of the graph,
+and the corridors between them become weighted edges.
+
+Every open cell is either a node or sits on an edge at some offset from the edge's start,
+so any question about cells can be answered on the (much smaller) graph.
+"""
+
+from pacai.core.actions import Actions
+from pacai.core.directions import Directions
+from pacai.util.priorityQueue import PriorityQueue
+
+class Edge(object):
+    """
+    A corridor between two nodes (which may be the same node, for loops).
+    The edge's cells are numbered by their offset from the start node:
+    the start node is at offset 0, and the end node is at offset `length`.
+    """
+
+    def __init__(self, id, start, end, cells, actions):
+        """
+        Args:
+            id: The id of this edge.
+            start: The id of the node this edge starts at.
+            end: The id of the node this edge ends at.
+            cells: All the cells along the edge (including both end nodes), in order.
+            actions: The actions that walk the edge from start to end.
+        """
+
+        self.id = id
+        self.start = start
+        self.end = end
+        self.cells = cells
+        self.actions = actions
+        self.length = len(actions)
+
+    def getActions(self, fromOffset, toOffset):
+        """
+        Get the actions that walk this edge from one offset to another (in either direction).
+        """
+
+        if (fromOffset <= toOffset):
+            return list(self.actions[fromOffset:toOffset])
+
+        return [Directions.REVERSE[action]
+                for action in reversed(self.actions[toOffset:fromOffset])]
+
+    def getCell(self, offset):
+        return self.cells[offset]
+
+class JunctionGraph(object):
+    """
+    The junctions and dead ends of a maze (the nodes),
+    connected by the corridors between them (the edges).
+
+    Cells are mapped to the graph with `JunctionGraph.getNodeId`
+    and `JunctionGraph.getEdgePosition`,
+    and shortest distances/paths between any two open cells are answered
+    with a Dijkstra search over the nodes (cached per source node).
+
+    Example:
+    ```
+    graph = JunctionGraph(gameState.getWalls())
+    graph.getDistance((1, 1), (10, 10))
+    graph.getPath((1, 1), (10, 10))
+    ```
+    """
+
+    def __init__(self, walls):
+        self._walls = walls
+
+        # Node id -> cell, and cell -> node id.
+        self._nodes = []
+        self._nodeIds = {}
+
+        self._edges = []
+
+        # Node id -> [(edge id, whether the node is the start of the edge), ...].
+        self._adjacent = []
+
+        # Corridor cell -> (edge id, offset).
+        self._edgePositions = {}
+
+        # Source node id -> (distances, the (edge, node) used to reach each node).
+        self._searches = {}
+
+        self._build()
+
+    def getDistance(self, cell1, cell2):
+        """
+        Get the maze distance between two open cells.
+        Returns None if there is no path between them.
+        """
+
+        result = self._search(cell1, cell2)
+        if (result is None):
+            return None
+
+        return result[0]
+
+    def getEdge(self, edgeId):
+        return self._edges[edgeId]
+
+    def getEdgePosition(self, cell):
+        """
+        Get the (edge id, offset) of a corridor cell,
+        or None if the cell is a node (or not an open cell).
+        """
+
+        return self._edgePositions.get(cell)
+
+    def getEdges(self):
+        return self._edges
+
+    def getExits(self, cell):
+        """
+        Get the nodes that can be reached from a cell without passing through another node,
+        as a list of (node id, distance).
+        A node's only exit is itself.
+        """
+
+        nodeId = self._nodeIds.get(cell)
+        if (nodeId is not None):
+            return [(nodeId, 0)]
+
+        edgeId, offset = self._edgePositions[cell]
+        edge = self._edges[edgeId]
+
+        return [(edge.start, offset), (edge.end, edge.length - offset)]
+
+    def getNode(self, nodeId):
+        """
+        Get the cell for a node.
+        """
+
+        return self._nodes[nodeId]
+
+    def getNodeId(self, cell):
+        """
+        Get the id of the node at a cell, or None if the cell is not a node.
+        """
+
+        return self._nodeIds.get(cell)
+
+    def getNodes(self):
+        """
+        Get the cells of all the nodes (in order of their id).
+        """
+
+        return self._nodes
+
+    def getNumEdges(self):
+        return len(self._edges)
+
+    def getNumNodes(self):
+        return len(self._nodes)
+
+    def getPath(self, cell1, cell2):
+        """
+        Get a shortest list of actions that walks from one open cell to another.
+        Returns None if there is no path between them.
+        """
+
+        result = self._search(cell1, cell2)
+        if (result is None):
+            return None
+
+        distance, startNode, endNode, direct = result
+
+        if (direct is not None):
+            edge, offset1, offset2 = direct
+            return edge.getActions(offset1, offset2)
+
+        if (startNode is None):
+            return []
+
+        actions = self._exitActions(cell1, startNode)
+
+        predecessors = self._getSearch(startNode)[1]
+        middle = []
+        node = endNode
+        while (node != startNode):
+            edgeId, previousNode = predecessors[node]
+            edge = self._edges[edgeId]
+
+            if (edge.end == node):
+                middle.append(edge.getActions(0, edge.length))
+            else:
+                middle.append(edge.getActions(edge.length, 0))
+
+            node = previousNode
+
+        for edgeActions in reversed(middle):
+            actions += edgeActions
+
+        exitActions = self._exitActions(cell2, endNode)
+        actions += [Directions.REVERSE[action] for action in reversed(exitActions)]
+
+        return actions
+
+    def _build(self):
+        walls = self._walls
+
+        openCells = walls.asList(False)
+        neighbors = {}
+        for cell in openCells:
+            neighbors[cell] = self._openNeighbors(cell)
+
+        for cell in openCells:
+            if (len(neighbors[cell]) != 2):
+                self._addNode(cell)
+
+        # Corridors are walked from one node to the next.
+        # Each edge is found from both of its ends, so remember the ends we have already walked.
+        walked = set()
+        for nodeId in range(len(self._nodes)):
+            self._walkEdges(nodeId, neighbors, walked)
+
+        # Anything left is a loop with no junctions on it, so make one of its cells a node.
+        for cell in openCells:
+            if (cell in self._nodeIds or cell in self._edgePositions):
+                continue
+
+            nodeId = self._addNode(cell)
+            self._walkEdges(nodeId, neighbors, walked)
+
+    def _addNode(self, cell):
+        nodeId = len(self._nodes)
+
+        self._nodes.append(cell)
+        self._nodeIds[cell] = nodeId
+        self._adjacent.append([])
+
+        return nodeId
+
+    def _exitActions(self, cell, nodeId):
+        """
+        Get the actions that walk from a cell to one of its exit nodes (see getExits()).
+        """
+
+        if (self._nodeIds.get(cell) == nodeId):
+            return []
+
+        edgeId, offset = self._edgePositions[cell]
+        edge = self._edges[edgeId]
+
+        if (edge.start == nodeId and edge.end == nodeId):
+            # A loop, go whichever way is shorter.
+            if (offset <= edge.length - offset):
+                return edge.getActions(offset, 0)
+
+            return edge.getActions(offset, edge.length)
+
+        if (edge.start == nodeId):
+            return edge.getActions(offset, 0)
+
+        return edge.getActions(offset, edge.length)
+
+    def _getSearch(self, sourceNode):
+        """
+        Run (or fetch the cached result of) a Dijkstra search over the nodes.
+        Returns the distance to each node and the (edge id, previous node) used to reach it.
+        """
+
+        if (sourceNode in self._searches):
+            return self._searches[sourceNode]
+
+        distances = {sourceNode: 0}
+        predecessors = {}
+        done = set()
+
+        queue = PriorityQueue()
+        queue.push(sourceNode, 0)
+
+        while (not queue.isEmpty()):
+            node = queue.pop()
+            if (node in done):
+                continue
+
+            done.add(node)
+
+            for (edgeId, isStart) in self._adjacent[node]:
+                edge = self._edges[edgeId]
+                nextNode = edge.end if isStart else edge.start
+
+                distance = distances[node] + edge.length
+                if (nextNode not in distances or distance < distances[nextNode]):
+                    distances[nextNode] = distance
+                    predecessors[nextNode] = (edgeId, node)
+                    queue.push(nextNode, distance)
+
+        self._searches[sourceNode] = (distances, predecessors)
+        return self._searches[sourceNode]
+
+    def _openNeighbors(self, cell):
+        x, y = cell
+        width = self._walls.getWidth()
+        height = self._walls.getHeight()
+
+        neighbors = []
+        for action in Directions.CARDINAL:
+            dx, dy = Actions.directionToVector(action)
+            nextX, nextY = int(x + dx), int(y + dy)
+
+            if (nextX < 0 or nextX >= width or nextY < 0 or nextY >= height):
+                continue
+
+            if (not self._walls[nextX][nextY]):
+                neighbors.append(((nextX, nextY), action))
+
+        return neighbors
+
+    def _search(self, cell1, cell2):
+        """
+        Find the shortest route between two cells.
+        Returns None if there is no route, otherwise:
+        (distance, start node, end node, (edge, offset1, offset2)).
+        Routes through the graph leave cell1 through the start node
+        and enter cell2 through the end node.
+        Routes that stay on a single edge have no nodes, but have the edge and both offsets.
+        """
+
+        if (self._walls[cell1[0]][cell1[1]] or self._walls[cell2[0]][cell2[1]]):
+            raise ValueError("Position is not an open cell: " + str((cell1, cell2)))
+
+        if (cell1 == cell2):
+            return (0, None, None, None)
+
+        best = None
+
+        position1 = self._edgePositions.get(cell1)
+        position2 = self._edgePositions.get(cell2)
+        if (position1 is not None and position2 is not None and position1[0] == position2[0]):
+            edge = self._edges[position1[0]]
+            best = (abs(position1[1] - position2[1]), None, None,
+                    (edge, position1[1], position2[1]))
+
+        for (startNode, startDistance) in self.getExits(cell1):
+            distances = self._getSearch(startNode)[0]
+
+            for (endNode, endDistance) in self.getExits(cell2):
+                if (endNode not in distances):
+                    continue
+
+                distance = startDistance + distances[endNode] + endDistance
+                if (best is None or distance < best[0]):
+                    best = (distance, startNode, endNode, None)
+
+        return best
+
+    def _walkEdges(self, nodeId, neighbors, walked):
+        """
+        Walk every corridor leaving a node (that has not already been walked) and add it as an edge.
+        """
+
+        start = self._nodes[nodeId]
+
+        for (firstCell, firstAction) in neighbors[start]:
+            if ((start, firstCell) in walked):
+                continue
+
+            cells = [start]
+            actions = [firstAction]
+
+            previous = start
+            cell = firstCell
+            while (cell not in self._nodeIds):
+                cells.append(cell)
+
+                for (nextCell, action) in neighbors[cell]:
+                    if (nextCell != previous):
+                        break
+
+                previous = cell
+                cell = nextCell
+                actions.append(action)
+
+            cells.append(cell)
+
+            walked.add((start, firstCell))
+            walked.add((cell, previous))
+
+            edgeId = len(self._edges)
+            edge = Edge(edgeId, nodeId, self._nodeIds[cell], cells, actions)
+            self._edges.append(edge)
+
+            self._adjacent[nodeId].append((edgeId, True))
+            self._adjacent[edge.end].append((edgeId, False))
+
+            for offset in range(1, len(cells) - 1):
+                self._edgePositions[cells[offset]] = (edgeId, offset)
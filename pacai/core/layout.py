@@ -1,8 +1,11 @@
 import os
 import random
 
+from pacai.core.actions import Actions
+from pacai.core.directions import Directions
 from pacai.core.distance import manhattan
 from pacai.core.grid import Grid
+from pacai.core.junctionGraph import JunctionGraph
 
 # By default, the layout directory is adjacent to this file.
 DEFAULT_LAYOUT_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'layouts')
@@ -24,11 +27,62 @@ class Layout(object):
         self.numGhosts = 0
         self.layoutText = layoutText
 
+        # Tables of the legal actions and neighbors for each open cell.
+        # These are built the first time they are needed (see getPossibleActions()).
+        self._possibleActions = None
+        self._legalNeighbors = None
+
+        # Built the first time it is needed (see getJunctionGraph()).
+        self._junctionGraph = None
+
         self.processLayoutText(layoutText, maxGhosts)
 
+    def getJunctionGraph(self):
+        """
+        Get the `pacai.core.junctionGraph.JunctionGraph` for this layout's walls.
+        """
+
+        if (self._junctionGraph is None):
+            self._junctionGraph = JunctionGraph(self.walls)
+
+        return self._junctionGraph
+
+    def getLegalNeighbors(self, position):
+        """
+        The same as `pacai.core.actions.Actions.getLegalNeighbors` on this layout's walls,
+        but integral positions are looked up in a precomputed table.
+        The caller should not modify the returned list.
+        """
+
+        if (self._legalNeighbors is None):
+            self._buildMoveTables()
+
+        neighbors = self._legalNeighbors.get(position)
+        if (neighbors is None):
+            return Actions.getLegalNeighbors(position, self.walls)
+
+        return neighbors
+
     def getNumGhosts(self):
         return self.numGhosts
 
+    def getPossibleActions(self, position, direction):
+        """
+        The same as `pacai.core.actions.Actions.getPossibleActions` on this layout's walls,
+        but integral positions are looked up in a precomputed table.
+        Agents between cells (e.g. slow scared ghosts) fall back to the regular computation.
+        The returned list is new and may be modified by the caller.
+        """
+
+        if (self._possibleActions is None):
+            self._buildMoveTables()
+
+        actions = self._possibleActions.get(position)
+        if (actions is None):
+            return Actions.getPossibleActions(position, direction, self.walls)
+
+        return list(actions)
+
     def isWall(self, pos):
         x, col = pos
         return self.walls[x][col]
@@ -78,6 +132,37 @@ class Layout(object):
     def deepCopy(self):
         return Layout(self.layoutText[:])
 
+    def _buildMoveTables(self):
+        """
+        Compute the legal actions and neighbors of every open cell.
+        The direction does not matter for agents that are exactly on a cell,
+        so a single entry per cell is enough.
+        """
+
+        self._possibleActions = {}
+        self._legalNeighbors = {}
+
+        for position in self.walls.asList(False):
+            # Open cells on the edge of the board (which no bundled layout has)
+            # are left to the regular computation.
+            x, y = position
+            if (x == 0 or y == 0 or x == self.width - 1 or y == self.height - 1):
+                continue
+
+            actions = Actions.getPossibleActions(position, Directions.STOP, self.walls)
+            self._possibleActions[position] = tuple(actions)
+            self._legalNeighbors[position] = Actions.getLegalNeighbors(position, self.walls)
+
+    def __getstate__(self):
+        # The move tables and junction graph are cheap to rebuild,
+        # so don't make pickles (like replays) carry them.
+        state = self.__dict__.copy()
+        state['_possibleActions'] = None
+        state['_legalNeighbors'] = None
+        state['_junctionGraph'] = None
+
+        return state
+
     def processLayoutText(self, layoutText, maxGhosts):
         """
         Coordinates are flipped from the input format to the (x, y) convention here
@@ -0,0 +1,170 @@
+"""
+Answer "how far is the closest X?" queries without a search per query.
+
+Instead of searching outwards from every position that is asked about,
+a `NearestTargets` runs a single breadth-first search outwards from all the targets at once
+(a multi-source BFS over the reversed moves).
+Afterwards, every cell knows its distance to the closest target
+and the first step towards it,
+so distance queries are O(1) and path queries are O(path length).
+
+Targets change (e.g. food gets eaten),
+so a `NearestTargetCache` keeps the results for the most recently used sets of targets.
+"""
+
+import collections
+
+from pacai.core.actions import Actions
+from pacai.core.directions import Directions
+
+DEFAULT_CACHE_SIZE = 64
+
+class NearestTargets(object):
+    """
+    The distance to (and the first step towards) the closest target from every reachable cell.
+    """
+
+    def __init__(self, walls, targets):
+        """
+        Args:
+            walls: The walls of the board.
+            targets: The positions of the targets (e.g. food, capsules, or opponents).
+        """
+
+        self._targets = frozenset(targets)
+
+        # Cell -> distance to the closest target.
+        self._distances = {}
+
+        # Cell -> the action that takes a step towards the closest target.
+        self._nextActions = {}
+
+        self._search(walls)
+
+    def distanceToNearest(self, position):
+        """
+        Get the maze distance from a position to the closest target,
+        or None if no target can be reached.
+        """
+
+        return self._distances.get(position)
+
+    def getTargets(self):
+        return self._targets
+
+    def nearestTarget(self, position):
+        """
+        Get the closest target to a position,
+        or None if no target can be reached.
+        """
+
+        if (position not in self._distances):
+            return None
+
+        x, y = position
+        while (position not in self._targets):
+            dx, dy = Actions.directionToVector(self._nextActions[position])
+            x, y = int(x + dx), int(y + dy)
+            position = (x, y)
+
+        return position
+
+    def pathToNearest(self, position):
+        """
+        Get a shortest list of actions from a position to the closest target,
+        or None if no target can be reached.
+        """
+
+        if (position not in self._distances):
+            return None
+
+        path = []
+
+        x, y = position
+        while (position not in self._targets):
+            action = self._nextActions[position]
+            path.append(action)
+
+            dx, dy = Actions.directionToVector(action)
+            x, y = int(x + dx), int(y + dy)
+            position = (x, y)
+
+        return path
+
+    def _search(self, walls):
+        width = walls.getWidth()
+        height = walls.getHeight()
+
+        frontier = collections.deque()
+        for target in sorted(self._targets):
+            self._distances[target] = 0
+            frontier.append(target)
+
+        while (len(frontier) > 0):
+            position = frontier.popleft()
+            distance = self._distances[position] + 1
+            x, y = position
+
+            for action in Directions.CARDINAL:
+                dx, dy = Actions.directionToVector(action)
+                nextX, nextY = int(x + dx), int(y + dy)
+
+                if (nextX < 0 or nextX >= width or nextY < 0 or nextY >= height):
+                    continue
+
+                if (walls[nextX][nextY] or (nextX, nextY) in self._distances):
+                    continue
+
+                # We got here by moving away from the target, so the way back is the reverse.
+                self._distances[(nextX, nextY)] = distance
+                self._nextActions[(nextX, nextY)] = Directions.REVERSE[action]
+                frontier.append((nextX, nextY))
+
+class NearestTargetCache(object):
+    """
+    `NearestTargets` for the most recently used sets of targets on a board.
+
+    Example:
+    ```
+    cache = NearestTargetCache(gameState.getWalls())
+    cache.distanceToNearest(gameState.getPacmanPosition(), gameState.getFoodList())
+    ```
+    """
+
+    def __init__(self, walls, maxSize = DEFAULT_CACHE_SIZE):
+        self._walls = walls
+        self._maxSize = maxSize
+        self._entries = collections.OrderedDict()
+
+    def distanceToNearest(self, position, targets):
+        return self.get(targets).distanceToNearest(position)
+
+    def get(self, targets):
+        """
+        Get the NearestTargets for a collection of targets,
+        only searching if this set of targets has not been seen recently.
+        """
+
+        key = frozenset(targets)
+
+        entry = self._entries.get(key)
+        if (entry is not None):
+            self._entries.move_to_end(key)
+            return entry
+
+        entry = NearestTargets(self._walls, key)
+        self._entries[key] = entry
+
+        if (len(self._entries) > self._maxSize):
+            self._entries.popitem(last = False)
+
+        return entry
+
+    def getWalls(self):
+        return self._walls
+
+    def nearestTarget(self, position, targets):
+        return self.get(targets).nearestTarget(position)
+
+    def pathToNearest(self, position, targets):
+        return self.get(targets).pathToNearest(position)
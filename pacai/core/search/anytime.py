@@ -0,0 +1,147 @@
+"""
+Anytime weighted A* (in the style of ARA*), for searching under a wall-clock deadline.
+
+The search starts as weighted A* (f = g + weight * h), which finds a (possibly costly) path quickly.
+Then, while there is time left, the weight is lowered and the search continues
+from where it left off (reusing its frontier instead of starting over),
+improving the path until the weight reaches 1 and the path is optimal
+(for an admissible heuristic).
+When the deadline hits, the best path found so far is returned.
+
+This is meant for agents with a time limit per move (e.g. capture agents, see
+`pacai.agents.capture.capture.CaptureAgent.searchPath`),
+and can be passed to a `pacai.agents.search.base.SearchAgent` with the `fn` argument
+(e.g. `fn=pacai.core.search.anytime.anytimeAStarSearch,timeLimit=2`).
+"""
+
+import logging
+import time
+
+from pacai.core.search.engine import NODE_COST
+from pacai.core.search.engine import getActions
+from pacai.core.search.engine import getHeuristic
+from pacai.core.search.engine import outOfBudget
+from pacai.util.priorityQueue import IndexedPriorityQueue
+
+# Seconds (well inside the one second move warning time of capture).
+DEFAULT_TIME_LIMIT = 0.5
+
+DEFAULT_WEIGHT = 3.0
+DEFAULT_WEIGHT_STEP = 0.5
+
+def anytimeAStarSearch(problem, heuristic = None, maxNodes = None,
+        timeLimit = DEFAULT_TIME_LIMIT, weight = DEFAULT_WEIGHT, weightStep = DEFAULT_WEIGHT_STEP):
+    """
+    Search with weighted A*, lowering the weight by `weightStep` (down to 1) after each path,
+    until the path is optimal or `timeLimit` seconds have passed (None for no time limit).
+
+    Returns the best path found in time,
+    or None if no path was found in time
+    (`pacai.agents.search.base.SearchAgent` falls back to stopping).
+    """
+
+    heuristic = getHeuristic(heuristic)
+
+    deadline = None
+    if (timeLimit is not None):
+        deadline = time.time() + timeLimit
+
+    # Heuristic values are needed again every time the weight changes.
+    estimates = {}
+
+    def estimate(state):
+        if (state not in estimates):
+            estimates[state] = heuristic(state, problem)
+
+        return estimates[state]
+
+    start = problem.startingState()
+
+    frontier = IndexedPriorityQueue()
+    frontier.push(start, weight * estimate(start))
+
+    # The best node for each state that has been reached.
+    nodes = {start: (start, None, None, 0)}
+
+    # Closed states that were reached more cheaply (after they were expanded) with this weight.
+    closed = set()
+    inconsistent = set()
+
+    # The cheapest goal node found so far.
+    best = None
+
+    numExpanded = 0
+    while (True):
+        while (not frontier.isEmpty()):
+            # No state left in the frontier can lead to a cheaper path with this weight.
+            if (best is not None and best[NODE_COST] <= frontier.getPriority(frontier.peek())):
+                break
+
+            if (deadline is not None and time.time() >= deadline):
+                logging.debug('Search ran out of time with a weight of %s.' % (str(weight)))
+                return _getPath(best)
+
+            if (outOfBudget(numExpanded, maxNodes)):
+                return _getPath(best)
+
+            state = frontier.pop()
+            node = nodes[state]
+
+            if (problem.isGoal(state)):
+                if (best is None or node[NODE_COST] < best[NODE_COST]):
+                    best = node
+
+                continue
+
+            closed.add(state)
+            numExpanded += 1
+
+            for (nextState, action, cost) in problem.successorStates(state):
+                nextCost = node[NODE_COST] + cost
+
+                oldNode = nodes.get(nextState)
+                if (oldNode is not None and oldNode[NODE_COST] <= nextCost):
+                    continue
+
+                # This can not lead to a cheaper path than the one we already have.
+                if (best is not None and nextCost + estimate(nextState) >= best[NODE_COST]):
+                    continue
+
+                nodes[nextState] = (nextState, node, action, nextCost)
+
+                if (nextState in closed):
+                    inconsistent.add(nextState)
+                else:
+                    frontier.update(nextState, nextCost + weight * estimate(nextState))
+
+            problem.recordFrontierSize(len(frontier))
+
+        if (best is not None):
+            logging.debug('Found a path with a cost of %s using a weight of %s.'
+                    % (str(best[NODE_COST]), str(weight)))
+
+        if (weight <= 1.0):
+            return _getPath(best)
+
+        weight = max(1.0, weight - weightStep)
+
+        # Continue with the same frontier (and the inconsistent states),
+        # reordered for the new weight.
+        states = [entry[2] for entry in frontier.heap] + list(inconsistent)
+
+        frontier = IndexedPriorityQueue()
+        for state in states:
+            frontier.push(state, nodes[state][NODE_COST] + weight * estimate(state))
+
+        closed = set()
+        inconsistent = set()
+
+def _getPath(node):
+    if (node is None):
+        return None
+
+    return getActions(node)
+
+# Abbreviations
+
+anytime = anytimeAStarSearch
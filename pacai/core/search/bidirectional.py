@@ -0,0 +1,216 @@
+"""
+Bidirectional search: search forwards from the start and backwards from the goals at the same time,
+and stop once the two searches meet (and no cheaper meeting is possible).
+
+Each search only has to cover about half the path,
+so on open boards (where the frontier grows with the square of the path length)
+far fewer nodes are expanded than with a single search.
+
+The problem must also be able to search backwards, with two more methods:
+ - `goalStates()`, which returns a list of all the goal states.
+ - `predecessorStates(state)`, the reverse of `successorStates`,
+   which returns a list of (predecessor state, action that takes the predecessor to this state,
+   cost of the action) tuples.
+
+`pacai.core.search.position.PositionSearchProblem` has both,
+and the searches here raise a ValueError (before searching) for problems that do not.
+
+Like the searches in `pacai.core.search.engine`,
+these can be passed to a `pacai.agents.search.base.SearchAgent` with the `fn` argument
+(e.g. `fn=pacai.core.search.bidirectional.biastar`).
+"""
+
+from pacai.core.search.engine import NODE_ACTION
+from pacai.core.search.engine import NODE_COST
+from pacai.core.search.engine import NODE_PARENT
+from pacai.core.search.engine import getActions
+from pacai.core.search.engine import outOfBudget
+from pacai.util.priorityQueue import IndexedPriorityQueue
+
+def bidirectionalAStarSearch(problem, heuristic = None, maxNodes = None):
+    """
+    Bidirectional A* (front-to-end):
+    each direction orders its frontier by its path cost plus a heuristic estimate
+    to the other end (the goal going forwards, the start going backwards).
+
+    Going backwards, the heuristic is given a `BackwardProblem`,
+    whose `goal` is the forward starting state.
+    So heuristics that estimate the distance to `problem.goal`
+    (like `pacai.core.search.heuristic.manhattan`) work in both directions.
+    If the problem has no `goal`, the backward direction does not use the heuristic.
+
+    The heuristic should be consistent for the path to be optimal.
+    """
+
+    _checkProblem(problem)
+
+    if (heuristic is None or not hasattr(problem, 'goal')):
+        backwardHeuristic = None
+    else:
+        backwardProblem = BackwardProblem(problem)
+        backwardHeuristic = lambda state: heuristic(state, backwardProblem)
+
+    forwardHeuristic = None
+    if (heuristic is not None):
+        forwardHeuristic = lambda state: heuristic(state, problem)
+
+    return _bidirectionalSearch(problem, forwardHeuristic, backwardHeuristic, maxNodes)
+
+def bidirectionalUniformCostSearch(problem, maxNodes = None):
+    """
+    Bidirectional uniform cost search.
+    When all the actions cost the same, this is also a bidirectional breadth first search.
+    """
+
+    _checkProblem(problem)
+    return _bidirectionalSearch(problem, None, None, maxNodes)
+
+class BackwardProblem(object):
+    """
+    A view of a problem for heuristics in the backward direction of a search.
+    The `goal` is the forward starting state,
+    and everything else is looked up on the original problem.
+    """
+
+    def __init__(self, problem):
+        self.goal = problem.startingState()
+        self._problem = problem
+
+    def __getattr__(self, name):
+        return getattr(self._problem, name)
+
+class _Direction(object):
+    """
+    One direction of a bidirectional search.
+    """
+
+    def __init__(self, startStates, expand, heuristic):
+        self.expand = expand
+        self.heuristic = heuristic
+
+        self.frontier = IndexedPriorityQueue()
+
+        # The best node for every state that has been reached (in the frontier or closed).
+        self.nodes = {}
+        self.closed = set()
+
+        for state in startStates:
+            self.nodes[state] = (state, None, None, 0)
+            self.frontier.push(state, self.getPriority(state, 0))
+
+    def getPriority(self, state, cost):
+        if (self.heuristic is None):
+            return cost
+
+        return cost + self.heuristic(state)
+
+    def getTopPriority(self):
+        return self.frontier.getPriority(self.frontier.peek())
+
+def _bidirectionalSearch(problem, forwardHeuristic, backwardHeuristic, maxNodes):
+    start = problem.startingState()
+    if (problem.isGoal(start)):
+        return []
+
+    forward = _Direction([start], problem.successorStates, forwardHeuristic)
+    backward = _Direction(problem.goalStates(), problem.predecessorStates, backwardHeuristic)
+
+    # The cheapest path found so far: (cost, forward node, backward node).
+    best = (float('inf'), None, None)
+
+    # Without heuristics, the frontiers are ordered by path cost,
+    # and the sum of the two cheapest frontier costs bounds any path that has not been found.
+    usesHeuristic = (forwardHeuristic is not None or backwardHeuristic is not None)
+
+    numExpanded = 0
+    while (not forward.frontier.isEmpty() and not backward.frontier.isEmpty()):
+        forwardTop = forward.getTopPriority()
+        backwardTop = backward.getTopPriority()
+
+        # Every path that has not been found yet costs at least this much.
+        bound = max(forwardTop, backwardTop)
+        if (not usesHeuristic):
+            bound = max(bound, forwardTop + backwardTop)
+
+        if (bound >= best[0]):
+            break
+
+        if (outOfBudget(numExpanded, maxNodes)):
+            return None
+
+        # Grow the smaller frontier.
+        if (len(forward.frontier) <= len(backward.frontier)):
+            best = _expand(forward, backward, best, True)
+        else:
+            best = _expand(backward, forward, best, False)
+
+        numExpanded += 1
+        problem.recordFrontierSize(len(forward.frontier) + len(backward.frontier))
+
+    if (best[1] is None):
+        return None
+
+    return _getPath(best[1], best[2])
+
+def _checkProblem(problem):
+    for name in ('goalStates', 'predecessorStates'):
+        if (not callable(getattr(problem, name, None))):
+            raise ValueError('Bidirectional search needs a problem with %s(), %s does not have one.'
+                    % (name, type(problem).__name__))
+
+def _expand(direction, other, best, isForward):
+    """
+    Expand the next state in one direction,
+    and return the (possibly) improved best path.
+    """
+
+    state = direction.frontier.pop()
+    node = direction.nodes[state]
+    direction.closed.add(state)
+
+    for (nextState, action, cost) in direction.expand(state):
+        if (nextState in direction.closed):
+            continue
+
+        nextCost = node[NODE_COST] + cost
+
+        oldNode = direction.nodes.get(nextState)
+        if (oldNode is not None and oldNode[NODE_COST] <= nextCost):
+            continue
+
+        nextNode = (nextState, node, action, nextCost)
+        direction.nodes[nextState] = nextNode
+        direction.frontier.update(nextState, direction.getPriority(nextState, nextCost))
+
+        # Check if the other direction has already reached this state.
+        otherNode = other.nodes.get(nextState)
+        if (otherNode is None or nextCost + otherNode[NODE_COST] >= best[0]):
+            continue
+
+        if (isForward):
+            best = (nextCost + otherNode[NODE_COST], nextNode, otherNode)
+        else:
+            best = (nextCost + otherNode[NODE_COST], otherNode, nextNode)
+
+    return best
+
+def _getPath(forwardNode, backwardNode):
+    """
+    Join the actions to the meeting state (forwards)
+    with the actions from the meeting state to the goal (backwards).
+    Backward nodes already hold the forward action that leads to their parent.
+    """
+
+    actions = getActions(forwardNode)
+
+    while (backwardNode[NODE_PARENT] is not None):
+        actions.append(backwardNode[NODE_ACTION])
+        backwardNode = backwardNode[NODE_PARENT]
+
+    return actions
+
+# Abbreviations
+
+bibfs = bidirectionalUniformCostSearch
+biucs = bidirectionalUniformCostSearch
+biastar = bidirectionalAStarSearch
@@ -0,0 +1,214 @@
+"""
+A shared engine for graph search over a `pacai.core.search.problem.SearchProblem`.
+
+All the searches here share the same machinery:
+ - Closed (and seen) sets are hashed, so membership checks are O(1).
+ - Search nodes only keep a pointer to their parent,
+   and the action path is only built once a goal is found.
+ - Path costs are accumulated as nodes are generated
+   (instead of calling `SearchProblem.actionsCost` on every path).
+ - Each state is only in a best-first frontier once
+   (see `pacai.util.priorityQueue.IndexedPriorityQueue`).
+ - An optional node budget (`maxNodes`) bounds the number of nodes expanded.
+   Searches that run out of budget give up and return None, just like searches that find no path.
+ - The frontier size is reported to the problem (see `SearchProblem.recordFrontierSize`).
+
+Any of these can be passed to a `pacai.agents.search.base.SearchAgent` with the `fn` argument
+(e.g. `fn=pacai.core.search.engine.astar`),
+and the searches that take a heuristic will be given the agent's `heuristic`.
+"""
+
+import collections
+import logging
+
+from pacai.util.priorityQueue import IndexedPriorityQueue
+
+# The parts of a search node: (state, parent node, action from the parent, path cost).
+NODE_STATE = 0
+NODE_PARENT = 1
+NODE_ACTION = 2
+NODE_COST = 3
+
+def aStarSearch(problem, heuristic = None, maxNodes = None):
+    """
+    Search the node that has the lowest combined cost and heuristic first.
+    """
+
+    heuristic = getHeuristic(heuristic)
+    return _bestFirstSearch(problem, lambda state, cost: cost + heuristic(state, problem),
+            maxNodes)
+
+def breadthFirstSearch(problem, maxNodes = None):
+    """
+    Search the shallowest nodes in the search tree first.
+    States are only ever added to the frontier once.
+    """
+
+    start = problem.startingState()
+    frontier = collections.deque([(start, None, None, 0)])
+    seen = {start}
+
+    numExpanded = 0
+    while (len(frontier) > 0):
+        node = frontier.popleft()
+        state = node[NODE_STATE]
+
+        if (problem.isGoal(state)):
+            return getActions(node)
+
+        if (outOfBudget(numExpanded, maxNodes)):
+            return None
+
+        numExpanded += 1
+        for (nextState, action, cost) in problem.successorStates(state):
+            if (nextState in seen):
+                continue
+
+            seen.add(nextState)
+            frontier.append((nextState, node, action, node[NODE_COST] + cost))
+
+        problem.recordFrontierSize(len(frontier))
+
+    return None
+
+def depthFirstSearch(problem, maxNodes = None):
+    """
+    Search the deepest nodes in the search tree first.
+    """
+
+    frontier = [(problem.startingState(), None, None, 0)]
+    closed = set()
+
+    numExpanded = 0
+    while (len(frontier) > 0):
+        node = frontier.pop()
+        state = node[NODE_STATE]
+
+        if (problem.isGoal(state)):
+            return getActions(node)
+
+        if (state in closed):
+            continue
+
+        if (outOfBudget(numExpanded, maxNodes)):
+            return None
+
+        closed.add(state)
+        numExpanded += 1
+
+        for (nextState, action, cost) in problem.successorStates(state):
+            if (nextState not in closed):
+                frontier.append((nextState, node, action, node[NODE_COST] + cost))
+
+        problem.recordFrontierSize(len(frontier))
+
+    return None
+
+def getActions(node):
+    """
+    Follow a search node's parent pointers back to the start,
+    and return the actions that lead to it.
+    """
+
+    actions = []
+    while (node[NODE_PARENT] is not None):
+        actions.append(node[NODE_ACTION])
+        node = node[NODE_PARENT]
+
+    actions.reverse()
+    return actions
+
+def getHeuristic(heuristic):
+    """
+    Get the heuristic to use for a search that was given `heuristic`
+    (which is None for no heuristic).
+    """
+
+    if (heuristic is None):
+        return lambda state, problem: 0
+
+    return heuristic
+
+def greedySearch(problem, heuristic = None, maxNodes = None):
+    """
+    Search the node that looks closest to a goal (by the heuristic alone) first.
+    This is fast, but the path found is not necessarily the cheapest.
+    """
+
+    heuristic = getHeuristic(heuristic)
+    return _bestFirstSearch(problem, lambda state, cost: heuristic(state, problem), maxNodes)
+
+def outOfBudget(numExpanded, maxNodes):
+    """
+    Check if a search that has expanded `numExpanded` nodes has used up its budget of `maxNodes`
+    (None for no budget), and warn when it has.
+    """
+
+    if (maxNodes is None or numExpanded < maxNodes):
+        return False
+
+    logging.warning('Search gave up after expanding %d nodes.' % (numExpanded))
+    return True
+
+def uniformCostSearch(problem, maxNodes = None):
+    """
+    Search the node of least total cost first.
+    """
+
+    return _bestFirstSearch(problem, lambda state, cost: cost, maxNodes)
+
+def _bestFirstSearch(problem, priorityFunction, maxNodes):
+    """
+    Expand nodes in order of the priority function (which gets a state and its path cost).
+    Ties are broken by insertion order.
+    Each state is in the frontier at most once,
+    reaching it more cheaply updates its node (and priority) in place.
+    """
+
+    start = problem.startingState()
+
+    frontier = IndexedPriorityQueue()
+    frontier.push(start, priorityFunction(start, 0))
+
+    # The best node for each state in the frontier.
+    nodes = {start: (start, None, None, 0)}
+    closed = set()
+
+    numExpanded = 0
+    while (not frontier.isEmpty()):
+        state = frontier.pop()
+        node = nodes.pop(state)
+
+        if (problem.isGoal(state)):
+            return getActions(node)
+
+        if (outOfBudget(numExpanded, maxNodes)):
+            return None
+
+        closed.add(state)
+        numExpanded += 1
+
+        for (nextState, action, cost) in problem.successorStates(state):
+            if (nextState in closed):
+                continue
+
+            nextCost = node[NODE_COST] + cost
+
+            oldNode = nodes.get(nextState)
+            if (oldNode is not None and oldNode[NODE_COST] <= nextCost):
+                continue
+
+            nodes[nextState] = (nextState, node, action, nextCost)
+            frontier.update(nextState, priorityFunction(nextState, nextCost))
+
+        problem.recordFrontierSize(len(frontier))
+
+    return None
+
+# Abbreviations
+
+bfs = breadthFirstSearch
+dfs = depthFirstSearch
+ucs = uniformCostSearch
+astar = aStarSearch
+greedy = greedySearch
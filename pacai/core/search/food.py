@@ -1,5 +1,6 @@
 from pacai.core.actions import Actions
 from pacai.core.directions import Directions
+from pacai.core.grid import BitGrid
 from pacai.core.search.problem import SearchProblem
 
 class FoodSearchProblem(SearchProblem):
@@ -9,14 +10,17 @@ class FoodSearchProblem(SearchProblem):
 
     A search state in this problem is a tuple (pacmanPosition, foodGrid).
     Wwhere pacmanPosition is a tuple (x, y) of integers specifying Pacman's position,
-    and foodGrid is a `pacai.core.grid.Grid` of either `True` or `False`,
+    and foodGrid is a `pacai.core.grid.BitGrid` of either `True` or `False`,
     specifying remaining food.
+    A `pacai.core.grid.BitGrid` is used (instead of a `pacai.core.grid.Grid`)
+    since every successor copies and hashes the food.
     """
 
     def __init__(self, startingGameState):
         super().__init__()
 
-        self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
+        self.start = (startingGameState.getPacmanPosition(),
+                BitGrid.fromGrid(startingGameState.getFood()))
         self.walls = startingGameState.getWalls()
         self.startingGameState = startingGameState
         self.heuristicInfo = {}  # A dictionary for the heuristic to store information
@@ -40,7 +44,7 @@ class FoodSearchProblem(SearchProblem):
             nextx, nexty = int(x + dx), int(y + dy)
             if not self.walls[nextx][nexty]:
                 nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
+                nextFood.set(nextx, nexty, False)
                 successors.append((((nextx, nexty), nextFood), direction, 1))
 
         return successors
@@ -51,7 +55,7 @@ class FoodSearchProblem(SearchProblem):
         If those actions include an illegal move, return 999999.
         """
 
-        x, y = self.startingState()[0]
+        x, y = self.startingGameState.getPacmanPosition()
         cost = 0
         for action in actions:
             # figure out the next state and see whether it's legal
@@ -62,3 +66,75 @@ class FoodSearchProblem(SearchProblem):
             cost += 1
 
         return cost
+
+class PackedFoodSearchProblem(FoodSearchProblem):
+    """
+    A `FoodSearchProblem` with a compact state representation.
+
+    A search state in this problem is a tuple of two ints (cellId, foodMask).
+    Every open cell gets an id (see `PackedFoodSearchProblem.getPosition`),
+    and every piece of food on the starting board gets a bit in the mask
+    (see `PackedFoodSearchProblem.getFoodPositions`).
+    A set bit means that the food is still there.
+
+    The cell neighbors and food bits are built once,
+    so generating a successor is just a table lookup and a bitwise and.
+    `pacai.core.search.heuristic.numFood` works with these states as well.
+    """
+
+    def __init__(self, startingGameState):
+        super().__init__(startingGameState)
+
+        self._cells = self.walls.asList(False)
+        self._cellIds = {cell: id for (id, cell) in enumerate(self._cells)}
+
+        self._food = self.start[1].asList()
+
+        # The bit for the food in each cell (zero for cells without food).
+        self._foodBits = [0] * len(self._cells)
+        for (index, food) in enumerate(self._food):
+            self._foodBits[self._cellIds[food]] = 1 << index
+
+        # The (neighbor id, action) for each cell.
+        self._neighbors = []
+        for (x, y) in self._cells:
+            neighbors = []
+            for direction in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
+                dx, dy = Actions.directionToVector(direction)
+                nextCell = (int(x + dx), int(y + dy))
+                if (nextCell in self._cellIds):
+                    neighbors.append((self._cellIds[nextCell], direction))
+
+            self._neighbors.append(neighbors)
+
+        self.start = (self._cellIds[startingGameState.getPacmanPosition()],
+                (1 << len(self._food)) - 1)
+
+    def getFoodPositions(self, foodMask):
+        """
+        Get the positions of the food that is left in a food mask.
+        """
+
+        return [food for (index, food) in enumerate(self._food) if (foodMask >> index) & 1]
+
+    def getPosition(self, cellId):
+        return self._cells[cellId]
+
+    def isGoal(self, state):
+        return state[1] == 0
+
+    def successorStates(self, state):
+        """
+        Returns successor states, the actions they require, and a cost of 1.
+        """
+
+        self._numExpanded += 1
+
+        foodMask = state[1]
+        foodBits = self._foodBits
+
+        successors = []
+        for (nextId, direction) in self._neighbors[state[0]]:
+            successors.append(((nextId, foodMask & ~foodBits[nextId]), direction, 1))
+
+        return successors
@@ -0,0 +1,163 @@
+"""
+Shared (and memoized) maze distance information for food search heuristics.
+
+Good food heuristics are built on maze distances between pacman and the food,
+and between the pieces of food themselves.
+Computing these inside the heuristic (e.g. with a search per food per call) is far too slow,
+so `FoodDistances` computes them once per problem,
+and stores itself in the problem's `heuristicInfo` (see `getFoodDistances`).
+"""
+
+from pacai.core import distanceCalculator
+
+# The key in a problem's heuristicInfo that FoodDistances are stored under.
+HEURISTIC_INFO_KEY = 'foodDistances'
+
+class FoodDistances(object):
+    """
+    Maze distances between all the food on the starting board (and from any cell to that food),
+    for a `pacai.core.search.food.FoodSearchProblem`
+    or a `pacai.core.search.food.PackedFoodSearchProblem`.
+
+    The minimum spanning tree (MST) of the remaining food is memoized by the remaining food,
+    which changes far less often than the full search state.
+    """
+
+    def __init__(self, problem):
+        layout = problem.startingGameState.getInitialLayout()
+        self._distances = distanceCalculator.getDistances(layout)
+        self._problem = problem
+
+        # The food is indexed in board order,
+        # which is also the bit order of PackedFoodSearchProblem's food masks.
+        self._food = problem.startingGameState.getFood().asList()
+        self._foodIds = [self._distances.getCellId(food) for food in self._food]
+
+        self._height = problem.walls.getHeight()
+        self._gridBits = [x * self._height + y for (x, y) in self._food]
+
+        self._foodToFood = []
+        for id1 in self._foodIds:
+            self._foodToFood.append([self._distances.getDistanceById(id1, id2)
+                    for id2 in self._foodIds])
+
+        # Food key -> (remaining food indexes, MST weight).
+        self._memo = {}
+
+    def getFoodDistance(self, index1, index2):
+        """
+        Get the maze distance between two pieces of food (by index).
+        """
+
+        return self._foodToFood[index1][index2]
+
+    def getMSTWeight(self, food):
+        """
+        Get the total weight of the minimum spanning tree over the remaining food
+        (using maze distances).
+        """
+
+        return self._lookup(food)[1]
+
+    def getNearestDistance(self, position, food):
+        """
+        Get the maze distance from a position (or cell id) to the closest remaining food.
+        Returns 0 if there is no food left.
+        """
+
+        indexes = self._lookup(food)[0]
+        if (len(indexes) == 0):
+            return 0
+
+        positionId = self._getCellId(position)
+        getDistanceById = self._distances.getDistanceById
+        foodIds = self._foodIds
+
+        return min([getDistanceById(positionId, foodIds[index]) for index in indexes])
+
+    def getRemainingFood(self, food):
+        """
+        Get the indexes of the remaining food.
+        The caller should not modify the list.
+        """
+
+        return self._lookup(food)[0]
+
+    def mstHeuristic(self, state):
+        """
+        The distance to the closest food plus the weight of the MST over all the remaining food.
+        Any path that eats all the food has to reach some food first,
+        and then connect all the food, so this is admissible (and consistent).
+        """
+
+        position, food = state
+        return self.getNearestDistance(position, food) + self.getMSTWeight(food)
+
+    def _computeMST(self, indexes):
+        """
+        Prim's algorithm over the complete graph of the remaining food.
+        """
+
+        if (len(indexes) <= 1):
+            return 0
+
+        distances = self._foodToFood
+
+        total = 0
+        first = indexes[0]
+        remaining = {index: distances[first][index] for index in indexes[1:]}
+
+        while (len(remaining) > 0):
+            nearest = min(remaining, key = remaining.get)
+            total += remaining.pop(nearest)
+
+            row = distances[nearest]
+            for index in remaining:
+                if (row[index] < remaining[index]):
+                    remaining[index] = row[index]
+
+        return total
+
+    def _getCellId(self, position):
+        if (isinstance(position, int)):
+            position = self._problem.getPosition(position)
+
+        id = self._distances.getCellId(position)
+        if (id is None):
+            raise ValueError('Position is not an open cell: ' + str(position))
+
+        return id
+
+    def _lookup(self, food):
+        # Food is either a mask (with a bit per food index) or a grid.
+        if (isinstance(food, int)):
+            key = food
+            bits = range(len(self._food))
+        elif (hasattr(food, 'getBits')):
+            key = food.getBits()
+            bits = self._gridBits
+        else:
+            # Other grids (e.g. a Grid or GridView) get the same key as a BitGrid would.
+            key = 0
+            for (x, y) in food.asList():
+                key |= (1 << (x * self._height + y))
+
+            bits = self._gridBits
+
+        result = self._memo.get(key)
+        if (result is None):
+            indexes = [index for (index, bit) in enumerate(bits) if ((key >> bit) & 1)]
+            result = (indexes, self._computeMST(indexes))
+            self._memo[key] = result
+
+        return result
+
+def getFoodDistances(problem):
+    """
+    Get the FoodDistances for a problem, creating them on the first call.
+    """
+
+    if (HEURISTIC_INFO_KEY not in problem.heuristicInfo):
+        problem.heuristicInfo[HEURISTIC_INFO_KEY] = FoodDistances(problem)
+
+    return problem.heuristicInfo[HEURISTIC_INFO_KEY]
@@ -4,6 +4,7 @@ goal in the provided `pacai.core.search.problem.SearchProblem`.
 """
 
 from pacai.core import distance
+from pacai.core.search.foodDistances import getFoodDistances
 
 def null(state, problem = None):
     """
@@ -32,9 +33,24 @@ def euclidean(position, problem):
 
     return distance.euclidean(position1, position2)
 
+def foodMST(state, problem):
+    """
+    This heuristic is the maze distance to the closest food
+    plus the weight of the minimum spanning tree over all the remaining food
+    (see `pacai.core.search.foodDistances.FoodDistances`).
+    It works with any food search problem.
+    """
+
+    return getFoodDistances(problem).mstHeuristic(state)
+
 def numFood(state, problem):
     """
     This heuristic is the amount of food left to on the board.
+    Food may be a grid or an int mask (see `pacai.core.search.food.PackedFoodSearchProblem`).
     """
 
-    return state[1].count()
+    food = state[1]
+    if (isinstance(food, int)):
+        return bin(food).count('1')
+
+    return food.count()
@@ -0,0 +1,205 @@
+"""
+Jump point search (JPS) for finding a position on a 4-connected board where every move costs 1
+(e.g. a `pacai.core.search.position.PositionSearchProblem` with the default cost function).
+
+On open boards, there are a huge number of shortest paths
+that only differ in the order of their moves, and A* expands the states on all of them.
+JPS only searches one canonical ordering of moves:
+horizontal moves can turn vertical anywhere,
+but vertical moves only turn horizontal when a wall forces them to
+(a horizontal neighbor that could not have been reached from the previous cell first).
+Instead of adding every neighbor to the frontier,
+the search "jumps" in a straight line until it reaches a cell where the path may need to turn
+(a jump point, or the goal),
+and only those cells are added to the frontier.
+Every shortest path can be reordered into a canonical one of the same length,
+so the path found is just as short as the one uniform cost search (or A*) finds.
+
+The jump points are searched with A* and the manhattan distance,
+so `jumpPointSearch` does not take a heuristic.
+Only the jump points that are expanded are counted as expanded nodes.
+"""
+
+from pacai.core import distance
+from pacai.core.actions import Actions
+from pacai.core.directions import Directions
+from pacai.core.search.engine import outOfBudget
+from pacai.core.search.position import DEFAULT_COST_FUNCTION
+from pacai.util.priorityQueue import IndexedPriorityQueue
+
+HORIZONTAL = [Directions.EAST, Directions.WEST]
+VERTICAL = [Directions.NORTH, Directions.SOUTH]
+
+# Direction -> the (integer) change in position.
+VECTORS = {direction: tuple([int(delta) for delta in Actions.directionToVector(direction)])
+        for direction in Directions.CARDINAL}
+
+# The parts of a search node: ((position, direction it was reached in), parent node, path cost).
+NODE_KEY = 0
+NODE_PARENT = 1
+NODE_COST = 2
+
+def jumpPointSearch(problem, maxNodes = None):
+    """
+    Find a shortest path to `problem.goal` using jump point search.
+
+    The problem must have `walls` and a `goal` position (like a `PositionSearchProblem`),
+    and every move must cost 1.
+    """
+
+    if (getattr(problem, 'costFn', DEFAULT_COST_FUNCTION) is not DEFAULT_COST_FUNCTION):
+        raise ValueError('Jump point search only works when every move costs 1.')
+
+    start = problem.startingState()
+    if (problem.isGoal(start)):
+        return []
+
+    goal = problem.goal
+    jumps = _JumpTable(problem.walls, goal)
+
+    # States are (position, the direction it was reached in),
+    # since the direction decides which way the search can go next.
+    startKey = (start, None)
+
+    frontier = IndexedPriorityQueue()
+    frontier.push(startKey, distance.manhattan(start, goal))
+
+    # The best node for each state in the frontier.
+    nodes = {startKey: (startKey, None, 0)}
+    closed = set()
+
+    numExpanded = 0
+    while (not frontier.isEmpty()):
+        key = frontier.pop()
+        node = nodes.pop(key)
+        position = key[0]
+
+        if (problem.isGoal(position)):
+            return _getActions(node)
+
+        if (outOfBudget(numExpanded, maxNodes)):
+            return None
+
+        closed.add(key)
+        numExpanded += 1
+        problem.recordExpanded(position)
+
+        for direction in jumps.getDirections(position, key[1]):
+            jumpPoint = jumps.jump(position, direction)
+            if (jumpPoint is None):
+                continue
+
+            nextKey = (jumpPoint, direction)
+            if (nextKey in closed):
+                continue
+
+            nextCost = node[NODE_COST] + distance.manhattan(position, jumpPoint)
+
+            oldNode = nodes.get(nextKey)
+            if (oldNode is not None and oldNode[NODE_COST] <= nextCost):
+                continue
+
+            nodes[nextKey] = (nextKey, node, nextCost)
+            frontier.update(nextKey, nextCost + distance.manhattan(jumpPoint, goal))
+
+        problem.recordFrontierSize(len(frontier))
+
+    return None
+
+class _JumpTable(object):
+    """
+    The jumps on a board (towards a specific goal).
+    Jumps only depend on the walls and the goal, so they are memoized.
+    """
+
+    def __init__(self, walls, goal):
+        self._width = walls.getWidth()
+        self._height = walls.getHeight()
+        self._open = [[not walls[x][y] for y in range(self._height)] for x in range(self._width)]
+        self._goal = goal
+
+        # (position, direction) -> jump point (or None).
+        self._jumps = {}
+
+    def getDirections(self, position, direction):
+        """
+        Get the directions to search from a jump point that was reached moving in a direction.
+        """
+
+        if (direction is None):
+            return Directions.CARDINAL
+
+        if (direction in HORIZONTAL):
+            return [direction] + VERTICAL
+
+        x, y = position
+        dy = VECTORS[direction][1]
+
+        directions = [direction]
+        for side in HORIZONTAL:
+            dx = VECTORS[side][0]
+            if (self._isOpen(x + dx, y) and not self._isOpen(x + dx, y - dy)):
+                directions.append(side)
+
+        return directions
+
+    def jump(self, position, direction):
+        """
+        Move from a position in a direction until a jump point (or the goal) is reached.
+        Returns None if a wall is reached first.
+        """
+
+        key = (position, direction)
+        if (key not in self._jumps):
+            self._jumps[key] = self._jump(position, direction)
+
+        return self._jumps[key]
+
+    def _isOpen(self, x, y):
+        return (0 <= x < self._width and 0 <= y < self._height and self._open[x][y])
+
+    def _jump(self, position, direction):
+        x, y = position
+        dx, dy = VECTORS[direction]
+
+        while (True):
+            x += dx
+            y += dy
+
+            if (not self._isOpen(x, y)):
+                return None
+
+            if ((x, y) == self._goal):
+                return (x, y)
+
+            if (dx == 0):
+                # Moving vertically, a wall can force a turn.
+                if ((self._isOpen(x - 1, y) and not self._isOpen(x - 1, y - dy))
+                        or (self._isOpen(x + 1, y) and not self._isOpen(x + 1, y - dy))):
+                    return (x, y)
+            else:
+                # Moving horizontally, the path can turn vertical here if that leads anywhere.
+                for vertical in VERTICAL:
+                    if (self.jump((x, y), vertical) is not None):
+                        return (x, y)
+
+def _getActions(node):
+    """
+    Follow a node's parent pointers back to the start,
+    filling in the straight moves between each pair of jump points.
+    """
+
+    actions = []
+    while (node[NODE_PARENT] is not None):
+        position, direction = node[NODE_KEY]
+        parentPosition = node[NODE_PARENT][NODE_KEY][0]
+
+        actions += [direction] * distance.manhattan(parentPosition, position)
+        node = node[NODE_PARENT]
+
+    actions.reverse()
+    return actions
+
+# Abbreviations
+
+jps = jumpPointSearch
@@ -0,0 +1,376 @@
+"""
+Searches that find optimal paths (with an admissible heuristic) in a bounded amount of memory.
+
+A* keeps every state it reaches, which is too much for big search problems
+(e.g. a `pacai.core.search.food.FoodSearchProblem` on `bigSearch`).
+The searches here trade some repeated work for a memory cap (`maxMemory`):
+ - `iterativeDeepeningAStarSearch` (IDA*) runs depth first searches with a growing f-cost bound.
+   Only the current path is kept, plus a transposition table of at most `maxMemory` states
+   that prunes states already reached more cheaply in the same iteration.
+ - `memoryBoundedAStarSearch` (SMA*) runs A* until it holds `maxMemory` nodes,
+   and then forgets the worst leaves (remembering their f-cost in their parent),
+   regenerating them later if they turn out to be needed.
+
+Like the searches in `pacai.core.search.engine`,
+these can be passed to a `pacai.agents.search.base.SearchAgent` with the `fn` argument
+(e.g. `fn=pacai.core.search.memoryBounded.idastar`),
+and the memory cap can be given to the agent as `maxMemory`.
+"""
+
+from pacai.core.search.engine import getHeuristic
+from pacai.core.search.engine import outOfBudget
+from pacai.util.priorityQueue import IndexedPriorityQueue
+
+DEFAULT_MAX_MEMORY = 100000
+
+def iterativeDeepeningAStarSearch(problem, heuristic = None, maxNodes = None,
+        maxMemory = DEFAULT_MAX_MEMORY):
+    """
+    Iterative deepening A* (IDA*).
+    Each iteration is a depth first search that does not go past the current f-cost bound,
+    and the next bound is the smallest f-cost that went past it.
+
+    `maxMemory` is the most states kept in the transposition table.
+    """
+
+    heuristic = getHeuristic(heuristic)
+
+    start = problem.startingState()
+    bound = heuristic(start, problem)
+
+    # State -> (iteration, the cheapest cost it was reached with in that iteration).
+    table = {}
+
+    iteration = 0
+    numExpanded = 0
+
+    while (bound != float('inf')):
+        iteration += 1
+
+        # Each frame on the stack is: (state, path cost, depth, action from the parent).
+        stack = [(start, 0, 0, None)]
+
+        # The states (and the actions that lead to them) from the start to the current state.
+        path = []
+        pathActions = []
+        onPath = set()
+
+        nextBound = float('inf')
+
+        while (len(stack) > 0):
+            state, cost, depth, action = stack.pop()
+
+            # Back up to this state's parent.
+            for oldState in path[depth:]:
+                onPath.discard(oldState)
+
+            del path[depth:]
+            del pathActions[depth:]
+
+            estimate = cost + heuristic(state, problem)
+            if (estimate > bound):
+                nextBound = min(nextBound, estimate)
+                continue
+
+            if (problem.isGoal(state)):
+                return pathActions[1:] + ([action] if (action is not None) else [])
+
+            entry = table.get(state)
+            if (entry is not None and entry[0] == iteration and entry[1] <= cost):
+                continue
+
+            if (entry is not None or len(table) < maxMemory):
+                table[state] = (iteration, cost)
+
+            if (outOfBudget(numExpanded, maxNodes)):
+                return None
+
+            numExpanded += 1
+
+            path.append(state)
+            pathActions.append(action)
+            onPath.add(state)
+
+            # Reversed, so successors are searched in the order that the problem gives them.
+            for (nextState, nextAction, stepCost) in reversed(problem.successorStates(state)):
+                if (nextState not in onPath):
+                    stack.append((nextState, cost + stepCost, depth + 1, nextAction))
+
+            problem.recordFrontierSize(len(stack))
+
+        bound = nextBound
+
+    return None
+
+def memoryBoundedAStarSearch(problem, heuristic = None, maxNodes = None,
+        maxMemory = DEFAULT_MAX_MEMORY):
+    """
+    Simplified memory-bounded A* (SMA*).
+
+    Successors are generated one at a time (from the deepest of the lowest f-cost nodes).
+    Once `maxMemory` nodes are held, the shallowest of the highest f-cost leaves is forgotten,
+    and its parent remembers its f-cost so that it can be generated again if needed.
+    Once all of a node's successors have been generated,
+    its f-cost is backed up to the lowest f-cost of its children.
+
+    Paths longer than `maxMemory` can not be held in memory, and will not be found.
+    """
+
+    return _MemoryBoundedSearch(problem, getHeuristic(heuristic), maxNodes, maxMemory).search()
+
+class _MemoryNode(object):
+    """
+    A search node in SMA*.
+    """
+
+    __slots__ = ('state', 'parent', 'action', 'cost', 'estimate', 'depth', 'index',
+            'successors', 'nextSuccessor', 'children', 'forgotten')
+
+    def __init__(self, state, parent, action, cost, estimate, index):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.cost = cost
+
+        # The f-cost (which may be backed up from the children).
+        self.estimate = estimate
+
+        self.depth = 0
+        if (parent is not None):
+            self.depth = parent.depth + 1
+
+        # The index of this node in its parent's successors.
+        self.index = index
+
+        # The problem's successors (filled in the first time the node is picked).
+        self.successors = None
+        self.nextSuccessor = 0
+
+        # The children in memory.
+        self.children = set()
+
+        # The index of each forgotten child -> its f-cost when it was forgotten.
+        self.forgotten = {}
+
+    def getActions(self):
+        actions = []
+
+        node = self
+        while (node.parent is not None):
+            actions.append(node.action)
+            node = node.parent
+
+        actions.reverse()
+        return actions
+
+    def isComplete(self):
+        """
+        Have all the successors been generated (and none forgotten)?
+        """
+
+        return (self.successors is not None and self.nextSuccessor == len(self.successors)
+                and len(self.forgotten) == 0)
+
+class _MemoryBoundedSearch(object):
+    """
+    The state of a single SMA* search.
+    """
+
+    def __init__(self, problem, heuristic, maxNodes, maxMemory):
+        self._problem = problem
+        self._heuristic = heuristic
+        self._maxNodes = maxNodes
+        self._maxMemory = max(2, maxMemory)
+
+        # The nodes that still have successors to generate, best (lowest f, deepest) first.
+        self._open = IndexedPriorityQueue()
+
+        # The nodes without children in memory, worst (highest f, shallowest) first.
+        self._leaves = IndexedPriorityQueue()
+
+        # State -> the cheapest node in memory for that state.
+        self._bestNodes = {}
+
+        self._numNodes = 0
+        self._numExpanded = 0
+
+    def search(self):
+        start = self._problem.startingState()
+        root = _MemoryNode(start, None, None, 0, self._heuristic(start, self._problem), None)
+        self._add(root)
+
+        while (not self._open.isEmpty()):
+            node = self._open.peek()
+
+            if (node.estimate == float('inf')):
+                return None
+
+            if (self._problem.isGoal(node.state)):
+                return node.getActions()
+
+            if (node.successors is None):
+                if (outOfBudget(self._numExpanded, self._maxNodes)):
+                    return None
+
+                self._numExpanded += 1
+                node.successors = self._problem.successorStates(node.state)
+
+            child = self._nextSuccessor(node)
+
+            if (node.isComplete()):
+                self._open.remove(node)
+
+            if (child is None):
+                # Nothing (worth keeping) was left to generate.
+                self._backup(node)
+                self._removeIfDone(node)
+                continue
+
+            node.children.add(child)
+            if (node in self._leaves):
+                self._leaves.remove(node)
+
+            # The node being expanded now has a child, so it can not be forgotten.
+            if (self._numNodes >= self._maxMemory):
+                self._forget()
+
+            self._add(child)
+            self._backup(node)
+
+            self._problem.recordFrontierSize(len(self._open))
+
+        return None
+
+    def _add(self, node):
+        self._open.push(node, (node.estimate, -node.depth))
+        self._leaves.push(node, (-node.estimate, node.depth))
+        self._bestNodes[node.state] = node
+        self._numNodes += 1
+
+    def _backup(self, node):
+        """
+        Once all of a node's successors have been generated (at least once),
+        its f-cost is the lowest f-cost of its children (in memory or forgotten),
+        and so on up the tree.
+        """
+
+        while (node is not None and node.successors is not None
+                and node.nextSuccessor == len(node.successors)):
+            estimates = [child.estimate for child in node.children] + list(node.forgotten.values())
+
+            estimate = float('inf')
+            if (len(estimates) > 0):
+                estimate = min(estimates)
+
+            if (estimate == node.estimate):
+                break
+
+            self._setEstimate(node, estimate)
+            node = node.parent
+
+    def _discard(self, node):
+        """
+        Remove a leaf from memory.
+        """
+
+        if (node in self._open):
+            self._open.remove(node)
+
+        if (node in self._leaves):
+            self._leaves.remove(node)
+
+        if (self._bestNodes.get(node.state) is node):
+            del self._bestNodes[node.state]
+
+        self._numNodes -= 1
+
+        parent = node.parent
+        parent.children.remove(node)
+
+        if (len(parent.children) == 0 and parent not in self._leaves):
+            self._leaves.push(parent, (-parent.estimate, parent.depth))
+
+    def _forget(self):
+        """
+        Forget the worst leaf (but never the root).
+        """
+
+        if (self._leaves.isEmpty()):
+            return
+
+        node = self._leaves.peek()
+        if (node.parent is None):
+            return
+
+        self._discard(node)
+        parent = node.parent
+
+        # Remember the forgotten child, unless it can never lead to a goal.
+        if (node.estimate != float('inf')):
+            parent.forgotten[node.index] = node.estimate
+
+            if (parent not in self._open):
+                self._open.push(parent, (parent.estimate, -parent.depth))
+
+        self._backup(parent)
+        self._removeIfDone(parent)
+
+    def _nextSuccessor(self, node):
+        """
+        Generate the next new successor (or, after those, the best forgotten one).
+        Successors whose state is already in memory (at no more cost) are skipped.
+        """
+
+        while (True):
+            if (node.nextSuccessor < len(node.successors)):
+                index = node.nextSuccessor
+                node.nextSuccessor += 1
+                forgottenEstimate = 0
+            elif (len(node.forgotten) > 0):
+                index = min(node.forgotten, key = node.forgotten.get)
+                forgottenEstimate = node.forgotten.pop(index)
+            else:
+                return None
+
+            state, action, stepCost = node.successors[index]
+            cost = node.cost + stepCost
+
+            bestNode = self._bestNodes.get(state)
+            if (bestNode is not None and bestNode.cost <= cost):
+                continue
+
+            # Children are never estimated as cheaper than their parent (or than when forgotten).
+            estimate = max(node.estimate, forgottenEstimate,
+                    cost + self._heuristic(state, self._problem))
+
+            # A path that does not fit in memory can not be finished.
+            if (node.depth + 2 >= self._maxMemory and not self._problem.isGoal(state)):
+                estimate = float('inf')
+
+            return _MemoryNode(state, node, action, cost, estimate, index)
+
+    def _removeIfDone(self, node):
+        """
+        Remove (non-root) nodes that have nothing left to generate and no children.
+        """
+
+        while (node.parent is not None and node.isComplete() and len(node.children) == 0):
+            self._discard(node)
+            self._backup(node.parent)
+            node = node.parent
+
+    def _setEstimate(self, node, estimate):
+        node.estimate = estimate
+
+        if (node in self._open):
+            self._open.remove(node)
+            self._open.push(node, (estimate, -node.depth))
+
+        if (node in self._leaves):
+            self._leaves.remove(node)
+            self._leaves.push(node, (-estimate, node.depth))
+
+# Abbreviations
+
+idastar = iterativeDeepeningAStarSearch
+smastar = memoryBoundedAStarSearch
@@ -34,6 +34,17 @@ class PositionSearchProblem(SearchProblem):
         if (self.startState is None):
             raise ValueError("Could not find starting location.")
 
+    def goalStates(self):
+        """
+        Returns the goal position (in a list),
+        for searches that work backwards from the goal (see `pacai.core.search.bidirectional`).
+        """
+
+        if (self.goal is None):
+            raise ValueError('%s has no goal position to list.' % (type(self).__name__))
+
+        return [self.goal]
+
     def startingState(self):
         return self.startState
 
@@ -74,6 +85,31 @@ class PositionSearchProblem(SearchProblem):
 
         return successors
 
+    def predecessorStates(self, state):
+        """
+        Returns the neighboring positions that can move into this state,
+        the action that does it, and the cost of entering this state.
+        """
+
+        predecessors = []
+        cost = self.costFn(state)
+
+        for action in Directions.CARDINAL:
+            x, y = state
+            dx, dy = Actions.directionToVector(action)
+            previousx, previousy = int(x - dx), int(y - dy)
+
+            if (not self.walls[previousx][previousy]):
+                predecessors.append(((previousx, previousy), action, cost))
+
+        # Bookkeeping for display purposes (the highlight in the GUI).
+        self._numExpanded += 1
+        if (state not in self._visitedLocations):
+            self._visitedLocations.add(state)
+            self._visitHistory.append(state)
+
+        return predecessors
+
     def actionsCost(self, actions):
         """
         Returns the cost of a particular sequence of actions.
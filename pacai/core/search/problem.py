@@ -26,6 +26,9 @@ class SearchProblem(abc.ABC):
         # The number of search nodes we expended.
         self._numExpanded = 0
 
+        # The most nodes a search had waiting to be expanded at once (see recordFrontierSize()).
+        self._peakFrontierSize = 0
+
         # Keep track of the states we have visited.
         # Children are not required to use these,
         # but doing so will allow the GUI to highlight the visited locations.
@@ -46,6 +49,9 @@ class SearchProblem(abc.ABC):
     def getExpandedCount(self):
         return self._numExpanded
 
+    def getPeakFrontierSize(self):
+        return self._peakFrontierSize
+
     def getVisitHistory(self):
         return self._visitHistory
 
@@ -60,6 +66,27 @@ class SearchProblem(abc.ABC):
 
         pass
 
+    def recordExpanded(self, state):
+        """
+        Searches that do not expand states with `SearchProblem.successorStates`
+        (e.g. `pacai.core.search.jumpPoint`) can report their expansions here,
+        so the expanded count (and the GUI highlight) stay up to date.
+        """
+
+        self._numExpanded += 1
+        if (state not in self._visitedLocations):
+            self._visitedLocations.add(state)
+            self._visitHistory.append(state)
+
+    def recordFrontierSize(self, size):
+        """
+        Searches can report the size of their frontier (e.g. after each expansion),
+        so the largest frontier can be reported.
+        """
+
+        if (size > self._peakFrontierSize):
+            self._peakFrontierSize = size
+
     @abc.abstractmethod
     def startingState(self):
         """
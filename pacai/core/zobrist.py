@@ -0,0 +1,96 @@
+"""
+Zobrist keys for incrementally hashing game states.
+
+Each board feature (a piece of food at a cell, a capsule at a cell, the game being over, etc)
+gets a fixed random key.
+A state's hash is the XOR of the keys of all the features it has,
+so adding or removing a single feature only costs a single XOR.
+"""
+
+import random
+
+# A fixed seed so hashes are stable across runs,
+# and a dedicated generator so we never disturb the global random state (and seeded games).
+ZOBRIST_SEED = 140
+KEY_BITS = 64
+KEY_MASK = (1 << KEY_BITS) - 1
+
+# A large odd multiplier used to spread arbitrary values (like scores) over all the key bits.
+MIX_MULTIPLIER = 0x9E3779B97F4A7C15
+
+_tables = {}
+
+class ZobristTable:
+    """
+    The random keys for a board of a specific size.
+    Tables are shared between all states with the same dimensions,
+    use `getTable` instead of constructing one directly.
+    """
+
+    def __init__(self, width, height, seed = ZOBRIST_SEED):
+        rng = random.Random(seed)
+
+        self._height = height
+
+        self._foodKeys = [rng.getrandbits(KEY_BITS) for i in range(width * height)]
+        self._capsuleKeys = [rng.getrandbits(KEY_BITS) for i in range(width * height)]
+
+        self.gameoverKey = rng.getrandbits(KEY_BITS)
+        self.winKey = rng.getrandbits(KEY_BITS)
+
+    def capsule(self, x, y):
+        return self._capsuleKeys[int(x) * self._height + int(y)]
+
+    def capsules(self, capsules):
+        """
+        Get the combined key for a collection of capsule positions.
+        """
+
+        key = 0
+        for (x, y) in capsules:
+            key ^= self.capsule(x, y)
+
+        return key
+
+    def food(self, x, y):
+        return self._foodKeys[int(x) * self._height + int(y)]
+
+    def foodGrid(self, grid):
+        """
+        Get the combined key for all the food in a grid.
+        """
+
+        key = 0
+        for (x, y) in grid.asList():
+            key ^= self.food(x, y)
+
+        return key
+
+    def flags(self, gameover, win):
+        key = 0
+
+        if (gameover):
+            key ^= self.gameoverKey
+
+        if (win):
+            key ^= self.winKey
+
+        return key
+
+def getTable(width, height):
+    """
+    Get the (shared) table for a board of the given size.
+    """
+
+    key = (width, height)
+    if (key not in _tables):
+        _tables[key] = ZobristTable(width, height)
+
+    return _tables[key]
+
+def mix(value):
+    """
+    Turn any hashable value into a key that uses all the key bits.
+    """
+
+    return (hash(value) * MIX_MULTIPLIER) & KEY_MASK
@@ -58,8 +58,8 @@ class ReflexAgent(BaseAgent):
 
         # Useful information you can extract.
         newPosition = successorGameState.getPacmanPosition()
-        newFood = successorGameState.getFood()
-        oldFood = currentGameState.getFood()
+        newFood = successorGameState.getFoodView()
+        oldFood = currentGameState.getFoodView()
         newGhostStates = successorGameState.getGhostStates()
         distance = 0
 
@@ -118,8 +118,12 @@ class MinimaxAgent(MultiAgentSearchAgent):
         if nextIndex >= gameState.getNumAgents():
             nextIndex = 0
             nextDepth += 1
-        minimax = [self.minimaxSearch(gameState.generateSuccessor(
-            agentIndex, action), nextDepth, nextIndex) for action in moves]
+        minimax = []
+        for action in moves:
+            # Walk the tree in place instead of generating a successor for every node.
+            gameState.applyAction(agentIndex, action)
+            minimax.append(self.minimaxSearch(gameState, nextDepth, nextIndex))
+            gameState.undo()
         if depth == 1 and agentIndex == 0:
             possibleIndices = [index for index in range(
                 len(minimax)) if minimax[index] == max(minimax)]
@@ -161,16 +165,20 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
             nextIndex = 0
             nextDepth += 1
         if depth == 1 and agentIndex == 0:
-            ab = [self.alphaBeta(gameState.generateSuccessor(
-                agentIndex, action), nextDepth, nextIndex, alpha, beta) for action in moves]
+            ab = []
+            for action in moves:
+                gameState.applyAction(agentIndex, action)
+                ab.append(self.alphaBeta(gameState, nextDepth, nextIndex, alpha, beta))
+                gameState.undo()
             possibleIndices = [index for index in range(
                 len(ab)) if ab[index] == max(ab)]
             return moves[random.choice(possibleIndices)]
         if agentIndex == 0:
             result = -float("inf")
             for action in moves:
-                result = max(result, self.alphaBeta(gameState.generateSuccessor(
-                    agentIndex, action), nextDepth, nextIndex, alpha, beta))
+                gameState.applyAction(agentIndex, action)
+                result = max(result, self.alphaBeta(gameState, nextDepth, nextIndex, alpha, beta))
+                gameState.undo()
                 if result >= beta:
                     return result
                 alpha = max(alpha, result)
@@ -178,8 +186,9 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
         else:
             result = float("inf")
             for action in moves:
-                result = min(result, self.alphaBeta(gameState.generateSuccessor(
-                    agentIndex, action), nextDepth, nextIndex, alpha, beta))
+                gameState.applyAction(agentIndex, action)
+                result = min(result, self.alphaBeta(gameState, nextDepth, nextIndex, alpha, beta))
+                gameState.undo()
                 if result <= alpha:
                     return result
                 beta = min(beta, result)
@@ -218,8 +227,11 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
         if nextIndex >= gameState.getNumAgents():
             nextIndex = 0
             nextDepth += 1
-        em = [self.expectimax(gameState.generateSuccessor(
-            agentIndex, action), nextDepth, nextIndex) for action in moves]
+        em = []
+        for action in moves:
+            gameState.applyAction(agentIndex, action)
+            em.append(self.expectimax(gameState, nextDepth, nextIndex))
+            gameState.undo()
         if depth == 1 and agentIndex == 0:
             possibleIndices = [index for index in range(
                 len(em)) if em[index] == max(em)]
@@ -240,7 +252,7 @@ def betterEvaluationFunction(currentGameState):
 
     """
     position = currentGameState.getPacmanPosition()
-    foods = currentGameState.getFood().asList()
+    foods = currentGameState.getFoodList()
     foodDist = 0
     for food in foods:
         foodDist += 2 * manhattan(position, food)
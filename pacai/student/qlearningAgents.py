@@ -175,20 +175,20 @@ class ApproximateQAgent(PacmanQAgent):
     def __init__(self, index,
                  extractor='pacai.core.featureExtractors.IdentityExtractor', **kwargs):
         super().__init__(index, **kwargs)
-        self.featExtractor = reflection.qualifiedImport(extractor)
+        self.featExtractor = reflection.qualifiedImport(extractor)()
 
         # You might want to initialize weights here.
         self.weights = counter.Counter()
 
     def getQValue(self, state, action):
-        features = self.featExtractor.getFeatures(self, state, action)
+        features = self.featExtractor.getFeatures(state, action)
         value = features * self.weights
         return value
 
     def update(self, state, action, nextState, reward):
         if len(self.weights) == 0:
             self.weights[(state, action)] = 0.0
-        features = self.featExtractor.getFeatures(self, state, action)
+        features = self.featExtractor.getFeatures(state, action)
         for i in features:
             features[i] = features[i] * self.getAlpha() * (reward + self.discountRate
                                       * self.getValue(nextState) - self.getQValue(state, action))
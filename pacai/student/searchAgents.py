@@ -8,13 +8,13 @@ Good luck and happy searching!
 import logging
 
 from pacai.core.actions import Actions
+from pacai.core.nearestTarget import NearestTargetCache
+from pacai.core.search.foodDistances import getFoodDistances
 from pacai.core.search.position import PositionSearchProblem
 from pacai.core.search.problem import SearchProblem
 from pacai.agents.base import BaseAgent
 from pacai.agents.search.base import SearchAgent
 from pacai.core.directions import Directions
-from pacai.student.search import breadthFirstSearch
-from pacai.student.search import aStarSearch
 
 
 class CornersProblem(SearchProblem):
@@ -186,18 +186,9 @@ def foodHeuristic(state, problem):
     Subsequent calls to this heuristic can access problem.heuristicInfo['wallCount'].
     """
 
-    position, foodGrid = state
-    res = 0
-    foodLocs = foodGrid.asList()
-    if not foodLocs:
-        return res
-    # Heuristic value is the maze distance to the farthest food - will be consistent
-    for food in foodLocs:
-        dist = len(breadthFirstSearch(PositionSearchProblem(
-            problem.startingGameState, start=position, goal=food)))
-        if dist > res:
-            res = dist
-    return res
+    # Maze distance to the closest food plus the MST over the remaining food.
+    # The distances are computed once per problem and the MST is memoized per food set.
+    return getFoodDistances(problem).mstHeuristic(state)
 
 
 class ClosestDotSearchAgent(SearchAgent):
@@ -208,13 +199,16 @@ class ClosestDotSearchAgent(SearchAgent):
     def __init__(self, index, **kwargs):
         super().__init__(index)
 
+        # Paths to the closest food, shared by every search with the same food left.
+        self._nearestFood = None
+
     def registerInitialState(self, state):
         self._actions = []
         self._actionIndex = 0
 
         currentState = state
 
-        while (currentState.getFood().count() > 0):
+        while (currentState.getNumFood() > 0):
             nextPathSegment = self.findPathToClosestDot(
                 currentState)  # The missing piece
             self._actions += nextPathSegment
@@ -234,9 +228,13 @@ class ClosestDotSearchAgent(SearchAgent):
         Returns a path (a list of actions) to the closest dot, starting from gameState.
         """
 
-        # Here are some useful elements of the startState
-        problem = AnyFoodSearchProblem(gameState)
-        return aStarSearch(problem, nullHeuristic)
+        # One BFS outwards from all the food answers this for every position.
+        walls = gameState.getWalls()
+        if (self._nearestFood is None or self._nearestFood.getWalls() is not walls):
+            self._nearestFood = NearestTargetCache(walls)
+
+        return self._nearestFood.pathToNearest(gameState.getPacmanPosition(),
+                gameState.getFoodList())
 
 
 def nullHeuristic(state, problem=None):
@@ -268,10 +266,14 @@ class AnyFoodSearchProblem(PositionSearchProblem):
         super().__init__(gameState, goal=None, start=start)
 
         # Store the food for later reference.
-        self.food = gameState.getFood()
+        self.food = gameState.getFoodView()
+
+    def goalStates(self):
+        # There is no single goal position, every food is a goal.
+        return self.food.asList()
 
     def isGoal(self, state):
-        return self.food[state[0]][state[1]]
+        return self.food.get(state[0], state[1])
 
 
 class ApproximateSearchAgent(BaseAgent):
@@ -56,3 +56,186 @@ class PriorityQueueWithFunction(PriorityQueue):
 
     def __len__(self):
         return len(self.heap)
+
+class IndexedPriorityQueue(object):
+    """
+    A priority queue (binary min-heap) that knows where each of its items are,
+    so an item's priority can be changed in place instead of inserting it again.
+
+    Items must be hashable, and each item can only be in the queue once.
+    Items never need to be compared to each other:
+    items with the same priority are popped in the order they were first pushed.
+    """
+
+    def __init__(self):
+        # Entries are [priority, insertion order, item].
+        self.heap = []
+
+        # Item -> index in the heap.
+        self._indexes = {}
+
+        self._count = 0
+
+    def contains(self, item):
+        return item in self._indexes
+
+    def decreaseKey(self, item, priority):
+        """
+        Lower the priority of an item that is already in the queue.
+        """
+
+        index = self._indexes.get(item)
+        if (index is None):
+            raise KeyError('Item not in queue: ' + str(item))
+
+        entry = self.heap[index]
+        if (priority > entry[0]):
+            raise ValueError('New priority (%s) is higher than the current priority (%s).'
+                    % (str(priority), str(entry[0])))
+
+        entry[0] = priority
+        self._siftUp(index)
+
+    def getPriority(self, item):
+        index = self._indexes.get(item)
+        if (index is None):
+            raise KeyError('Item not in queue: ' + str(item))
+
+        return self.heap[index][0]
+
+    def isEmpty(self):
+        return len(self.heap) == 0
+
+    def peek(self):
+        """
+        Get the lowest-priority item without removing it.
+        """
+
+        return self.heap[0][2]
+
+    def pop(self):
+        """
+        Remove and return the lowest-priority item.
+        """
+
+        entry = self.heap[0]
+        last = self.heap.pop()
+
+        if (len(self.heap) > 0):
+            self.heap[0] = last
+            self._indexes[last[2]] = 0
+            self._siftDown(0)
+
+        del self._indexes[entry[2]]
+        return entry[2]
+
+    def push(self, item, priority):
+        """
+        Add a new item to the queue.
+        Use `IndexedPriorityQueue.update` for items that may already be in the queue.
+        """
+
+        if (item in self._indexes):
+            raise ValueError('Item already in queue: ' + str(item))
+
+        self.heap.append([priority, self._count, item])
+        self._count += 1
+
+        self._indexes[item] = len(self.heap) - 1
+        self._siftUp(len(self.heap) - 1)
+
+    def remove(self, item):
+        """
+        Remove an item from the queue (wherever it is), and return its priority.
+        """
+
+        index = self._indexes.pop(item, None)
+        if (index is None):
+            raise KeyError('Item not in queue: ' + str(item))
+
+        entry = self.heap[index]
+        last = self.heap.pop()
+
+        if (index < len(self.heap)):
+            self.heap[index] = last
+            self._indexes[last[2]] = index
+            self._siftUp(index)
+            self._siftDown(self._indexes[last[2]])
+
+        return entry[0]
+
+    def update(self, item, priority):
+        """
+        Push an item if it is not in the queue,
+        or lower its priority if it is in the queue with a higher priority
+        (otherwise, do nothing).
+        Returns True if the queue was changed.
+        """
+
+        index = self._indexes.get(item)
+        if (index is None):
+            self.push(item, priority)
+            return True
+
+        if (priority >= self.heap[index][0]):
+            return False
+
+        self.heap[index][0] = priority
+        self._siftUp(index)
+        return True
+
+    def _siftDown(self, index):
+        heap = self.heap
+        size = len(heap)
+        entry = heap[index]
+
+        while (True):
+            child = 2 * index + 1
+            if (child >= size):
+                break
+
+            # Use the smaller child.
+            if (child + 1 < size and _entryLess(heap[child + 1], heap[child])):
+                child += 1
+
+            if (not _entryLess(heap[child], entry)):
+                break
+
+            heap[index] = heap[child]
+            self._indexes[heap[index][2]] = index
+            index = child
+
+        heap[index] = entry
+        self._indexes[entry[2]] = index
+
+    def _siftUp(self, index):
+        heap = self.heap
+        entry = heap[index]
+
+        while (index > 0):
+            parent = (index - 1) // 2
+            if (not _entryLess(entry, heap[parent])):
+                break
+
+            heap[index] = heap[parent]
+            self._indexes[heap[index][2]] = index
+            index = parent
+
+        heap[index] = entry
+        self._indexes[entry[2]] = index
+
+    def __contains__(self, item):
+        return item in self._indexes
+
+    def __len__(self):
+        return len(self.heap)
+
+def _entryLess(a, b):
+    """
+    Compare heap entries by priority, and then by insertion order (never by item).
+    """
+
+    if (a[0] != b[0]):
+        return a[0] < b[0]
+
+    return a[1] < b[1]
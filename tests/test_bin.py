@@ -1,8 +1,12 @@
+import os
+import tempfile
 import unittest
 
 from pacai.bin import capture
 from pacai.bin import gridworld
 from pacai.bin import pacman
+from pacai.bin import searchbench
+from pacai.core.search.food import FoodSearchProblem
 
 """
 This is a test class to assess the executables of this project.
@@ -67,5 +71,29 @@ class BinTest(unittest.TestCase):
         # Run game of capture with random generated map with seed value.
         capture.main(['--null-graphics', '--layout', 'RANDOM94'])
 
+    def test_searchbench(self):
+        # Benchmark a small layout, and compare it against itself.
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = os.path.join(tempDir, 'results.json')
+
+            args = ['--quiet', '--no-memory', '--layouts', 'tinyMaze']
+            self.assertEqual(0, searchbench.main(args + ['--output', path]))
+            self.assertEqual(0, searchbench.main(args + ['--baseline', path, '--tolerance', '100']))
+
+        old = {'layout': 'tinyMaze', 'status': 'ok', 'cost': 8, 'expanded': 15, 'time': 1.0}
+        new = dict(old, expanded = 20, time = 2.0)
+        self.assertEqual(2, len(searchbench.compareResults([new], [old])))
+        self.assertEqual(0, len(searchbench.compareResults([old], [new])))
+
+        # Runs that hit their time limit depend on the machine, so only the time is compared.
+        new = dict(new, deadline = True)
+        self.assertEqual(1, len(searchbench.compareResults([new], [old])))
+
+        # A search that runs out of time is reported as such.
+        result = searchbench.runBenchmark('tinySearch', 'food', FoodSearchProblem, 'anytime',
+                'foodMST', measureMemory = False, timeLimit = 0)
+        self.assertEqual('deadline', result['status'])
+        self.assertTrue(result['deadline'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,203 @@
+import os
+import tempfile
+import unittest
+
+from pacai.core import distanceCalculator
+from pacai.core.actions import Actions
+from pacai.core.distance import manhattan
+from pacai.core.layout import getLayout
+from pacai.core.nearestTarget import NearestTargetCache
+
+LAYOUT = 'tinyCapture'
+
+"""
+Test maze distance computation and caching.
+"""
+class DistanceTest(unittest.TestCase):
+    def tearDown(self):
+        distanceCalculator.setCacheDir(None)
+
+    def test_process_cache(self):
+        first = distanceCalculator.getDistances(getLayout(LAYOUT))
+        second = distanceCalculator.getDistances(getLayout(LAYOUT))
+
+        # The same walls (even from a different layout object) share a table.
+        self.assertIs(first, second)
+
+        # Only the most recently used tables are kept.
+        cacheSize = distanceCalculator.DISTANCE_CACHE_SIZE
+        try:
+            distanceCalculator.DISTANCE_CACHE_SIZE = 1
+            distanceCalculator.getDistances(getLayout('testMaze'))
+            self.assertIsNone(distanceCalculator.getCachedDistances(getLayout(LAYOUT).walls))
+        finally:
+            distanceCalculator.DISTANCE_CACHE_SIZE = cacheSize
+
+    def test_disk_cache(self):
+        layout = getLayout(LAYOUT)
+        expected = distanceCalculator.computeDistances(layout)
+
+        with tempfile.TemporaryDirectory() as cacheDir:
+            path = os.path.join(cacheDir, 'distances' + distanceCalculator.CACHE_FILE_EXTENSION)
+
+            distanceCalculator.saveDistances(path, layout.walls, expected)
+            self.assertEqual(expected, distanceCalculator.loadDistances(path, layout.walls))
+
+            # The same file can be mapped (read-only) instead of read.
+            attached = distanceCalculator.attachDistances(path, layout.walls)
+            self.assertEqual(expected, attached)
+            self.assertTrue(attached.getArray().readonly)
+
+            distancer = distanceCalculator.Distancer(layout)
+            self.assertTrue(distancer.attachMazeDistances(path))
+            cells = layout.walls.asList(False)
+            self.assertEqual(expected.getDistance(cells[0], cells[-1]),
+                    distancer.getDistance(cells[0], cells[-1]))
+
+            # A table for other walls is rejected.
+            otherLayout = getLayout('defaultCapture')
+            self.assertIsNone(distanceCalculator.loadDistances(path, otherLayout.walls))
+            self.assertIsNone(distanceCalculator.attachDistances(path, otherLayout.walls))
+
+    def test_matrix(self):
+        layout = getLayout(LAYOUT)
+        distances = distanceCalculator.computeDistances(layout)
+        cells = layout.walls.asList(False)
+
+        self.assertEqual(len(cells) ** 2, len(distances.getArray()))
+
+        for source in cells:
+            self.assertEqual(0, distances.getDistance(source, source))
+
+            for target in cells:
+                distance = distances.getDistance(source, target)
+                self.assertEqual(distance, distances.getDistance(target, source))
+                self.assertLessEqual(manhattan(source, target), distance)
+
+                # Every other cell is one step closer to one of our neighbors.
+                if (source != target):
+                    x, y = source
+                    neighbors = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
+                    self.assertEqual(distance - 1, min([distances.getDistance(neighbor, target)
+                            for neighbor in neighbors if neighbor in distances.getCells()]))
+
+        self.assertRaises(Exception, distances.getDistance, (0, 0), cells[0])
+
+    def test_lazy(self):
+        layout = getLayout('defaultCapture')
+        expected = distanceCalculator.computeDistances(layout)
+        cells = layout.walls.asList(False)
+
+        distancer = distanceCalculator.Distancer(layout, lazy = True, maxRows = 4)
+        distancer.getMazeDistances()
+
+        for source in cells[::7]:
+            for target in cells[::5]:
+                self.assertEqual(expected.getDistance(source, target),
+                        distancer.getDistance(source, target))
+
+        stats = distancer.getStats()
+        self.assertEqual(4, stats['rows'])
+        self.assertEqual(stats['misses'] - 4, stats['evictions'])
+        self.assertGreater(stats['hits'], 0)
+
+        # A byte limit smaller than a single row still keeps one row.
+        table = distanceCalculator.LazyDistanceTable(layout.walls, maxBytes = 1)
+        table.getDistance(cells[0], cells[1])
+        table.getDistance(cells[2], cells[3])
+        self.assertEqual(1, table.getStats()['rows'])
+
+    def test_background(self):
+        layout = getLayout('defaultCapture')
+        expected = distanceCalculator.computeDistances(layout)
+        cells = layout.walls.asList(False)
+
+        table = distanceCalculator.BackgroundDistanceTable(layout.walls)
+
+        # Without any time, nothing is computed and we get Manhattan distances.
+        for target in cells[::5]:
+            self.assertEqual(manhattan(cells[0], target), table.getDistance(cells[0], target))
+
+        table.addTime(None)
+        self.assertTrue(table.wait(10))
+        self.assertEqual(expected, table.getMatrix())
+
+        # Finished tables are shared through the process cache.
+        self.assertIs(table.getMatrix(), distanceCalculator.getCachedDistances(layout.walls))
+        self.assertIsNone(distanceCalculator.getBackgroundTable(layout.walls))
+
+        # Rows can also be computed in the calling thread, for a slice of time.
+        table = distanceCalculator.BackgroundDistanceTable(layout.walls)
+        self.assertFalse(table.compute(0))
+        self.assertEqual(0, table.getNumRows())
+
+        self.assertTrue(table.compute(None))
+        self.assertEqual(expected, table.getMatrix())
+
+    def test_background_cache(self):
+        first = getLayout('testMaze').walls
+        second = getLayout('tinyMaze').walls
+
+        cacheSize = distanceCalculator.DISTANCE_CACHE_SIZE
+        try:
+            distanceCalculator.DISTANCE_CACHE_SIZE = 1
+
+            # Complete distances are never put in the background.
+            distanceCalculator._distanceCache.clear()
+
+            table = distanceCalculator.getBackgroundTable(first)
+            self.assertIs(table, distanceCalculator.getBackgroundTable(first))
+
+            # Only the most recently used unfinished tables are kept.
+            other = distanceCalculator.getBackgroundTable(second)
+            self.assertIsNot(table, distanceCalculator.getBackgroundTable(first))
+
+            # Finished tables are dropped.
+            self.assertTrue(other.compute(None))
+            self.assertNotIn(distanceCalculator.wallsFingerprint(second),
+                    distanceCalculator._backgroundTables)
+        finally:
+            distanceCalculator.DISTANCE_CACHE_SIZE = cacheSize
+
+    def test_nearest_target(self):
+        layout = getLayout('mediumClassic')
+        distances = distanceCalculator.computeDistances(layout)
+        cells = layout.walls.asList(False)
+        targets = layout.food.asList()[::9]
+
+        cache = NearestTargetCache(layout.walls)
+        nearest = cache.get(targets)
+        self.assertIs(nearest, cache.get(list(reversed(targets))))
+
+        for cell in cells:
+            expected = min([distances.getDistance(cell, target) for target in targets])
+            self.assertEqual(expected, nearest.distanceToNearest(cell))
+
+            path = nearest.pathToNearest(cell)
+            self.assertEqual(expected, len(path))
+
+            position = cell
+            for action in path:
+                x, y = Actions.getSuccessor(position, action)
+                position = (int(x), int(y))
+                self.assertFalse(layout.walls[position[0]][position[1]])
+
+            self.assertIn(position, targets)
+            self.assertEqual(position, nearest.nearestTarget(cell))
+
+        self.assertIsNone(cache.distanceToNearest(cells[0], []))
+
+    def test_fingerprint(self):
+        walls = getLayout(LAYOUT).walls
+        self.assertEqual(distanceCalculator.wallsFingerprint(walls),
+                distanceCalculator.wallsFingerprint(walls.copy()))
+
+        otherWalls = walls.copy()
+        x, y = otherWalls.asList(False)[0]
+        otherWalls[x][y] = True
+
+        self.assertNotEqual(distanceCalculator.wallsFingerprint(walls),
+                distanceCalculator.wallsFingerprint(otherWalls))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import random
+import unittest
+
+from pacai.bin.capture import CaptureGameState
+from pacai.bin.pacman import PacmanGameState
+from pacai.core import zobrist
+from pacai.core.layout import getLayout
+
+NUM_PLAYOUTS = 5
+MAX_MOVES = 200
+
+"""
+Test game state bookkeeping over random playouts.
+"""
+class GameStateTest(unittest.TestCase):
+    def _playout(self, state, rng):
+        states = [state]
+
+        agentIndex = 0
+        for i in range(MAX_MOVES):
+            if (state.isOver()):
+                break
+
+            action = rng.choice(state.getLegalActions(agentIndex))
+            state = state.generateSuccessor(agentIndex, action)
+            states.append(state)
+
+            agentIndex = (agentIndex + 1) % state.getNumAgents()
+
+        return states
+
+    def _initialStates(self):
+        return [
+            PacmanGameState(getLayout('smallClassic')),
+            CaptureGameState(getLayout('defaultCapture'), MAX_MOVES),
+        ]
+
+    def test_incremental_hash(self):
+        rng = random.Random(4)
+
+        for initialState in self._initialStates():
+            for i in range(NUM_PLAYOUTS):
+                for state in self._playout(initialState, rng):
+                    table = zobrist.getTable(state.getWalls().getWidth(),
+                            state.getWalls().getHeight())
+
+                    expected = (zobrist.mix(state.getInitialLayout())
+                            ^ zobrist.mix(state.getScore())
+                            ^ table.flags(state.isOver(), state.isWin())
+                            ^ table.foodGrid(state.getFood())
+                            ^ table.capsules(state.getCapsules()))
+
+                    self.assertEqual(expected, state._zobrist)
+
+    def test_hash_consistent_with_equality(self):
+        rng = random.Random(5)
+
+        for initialState in self._initialStates():
+            states = self._playout(initialState, rng)
+            for state in states:
+                other = state._initSuccessor()
+                self.assertEqual(state, other)
+                self.assertEqual(hash(state), hash(other))
+
+    def test_capture_food_counts(self):
+        rng = random.Random(6)
+        initialState = CaptureGameState(getLayout('defaultCapture'), MAX_MOVES)
+
+        for i in range(NUM_PLAYOUTS):
+            for state in self._playout(initialState, rng):
+                self.assertEqual(state.getRedFood().count(), state.getRedFoodCount())
+                self.assertEqual(state.getBlueFood().count(), state.getBlueFoodCount())
+
+    def test_food_lists_are_copies(self):
+        state = CaptureGameState(getLayout('defaultCapture'), MAX_MOVES)
+        redCount = state.getRedFoodCount()
+        blueCount = state.getBlueFoodCount()
+
+        # Lists from the food grids belong to the caller, and changing them does not change the state.
+        state.getRedFood().asList().clear()
+        state.getBlueFood().asList().pop()
+        state.getFoodView().asList().clear()
+
+        successor = state.generateSuccessor(0, state.getLegalActions(0)[0])
+        for gameState in [state, successor]:
+            self.assertEqual(redCount, len(gameState.getRedFood().asList()))
+            self.assertEqual(redCount, gameState.getRedFood().count())
+            self.assertEqual(blueCount, len(gameState.getBlueFood().asList()))
+            self.assertEqual(blueCount, gameState.getBlueFood().count())
+            self.assertEqual(redCount + blueCount, len(gameState.getFoodList()))
+
+    def _assertSameState(self, expected, actual):
+        self.assertEqual(expected, actual)
+        self.assertEqual(hash(expected), hash(actual))
+        self.assertEqual(expected.getLastAgentMoved(), actual.getLastAgentMoved())
+        self.assertEqual(expected.getLastFoodEaten(), actual.getLastFoodEaten())
+        self.assertEqual(expected.getLastCapsuleEaten(), actual.getLastCapsuleEaten())
+        self.assertEqual(sorted(expected.getFoodList()), sorted(actual.getFoodList()))
+
+        for expectedAgent, actualAgent in zip(expected.getAgentStates(), actual.getAgentStates()):
+            self.assertEqual(expectedAgent.getDirection(), actualAgent.getDirection())
+
+        if (isinstance(expected, CaptureGameState)):
+            self.assertEqual(expected.getTimeleft(), actual.getTimeleft())
+            self.assertEqual(expected.getRedFoodCount(), actual.getRedFoodCount())
+            self.assertEqual(expected.getBlueFoodCount(), actual.getBlueFoodCount())
+            self.assertEqual(expected.getRedFood(), actual.getRedFood())
+            self.assertEqual(expected.getBlueFood(), actual.getBlueFood())
+            self.assertEqual(expected.getRedCapsules(), actual.getRedCapsules())
+            self.assertEqual(expected.getBlueCapsules(), actual.getBlueCapsules())
+
+    def test_successor_methods_agree(self):
+        rng = random.Random(7)
+
+        for initialState in self._initialStates():
+            for i in range(NUM_PLAYOUTS):
+                state = initialState
+                agentIndex = 0
+
+                for move in range(MAX_MOVES):
+                    if (state.isOver()):
+                        break
+
+                    original = state._initSuccessor()
+                    originalAgents = [agentState.copy() for agentState in state.getAgentStates()]
+                    actions = state.getLegalActions(agentIndex)
+                    batch = state.generateSuccessors(agentIndex)
+                    self.assertEqual(actions, [action for (action, successor) in batch])
+
+                    for (action, batchSuccessor) in batch:
+                        successor = state.generateSuccessor(agentIndex, action)
+                        self._assertSameState(successor, batchSuccessor)
+
+                        # Successors share agent states, make sure the parent was not modified.
+                        self.assertEqual(originalAgents, state.getAgentStates())
+
+                        state.applyAction(agentIndex, action)
+                        self._assertSameState(successor, state)
+
+                        state.undo()
+                        self._assertSameState(original, state)
+                        self.assertEqual(originalAgents, state.getAgentStates())
+
+                    # Applying actions in place must not modify successors that share with the state.
+                    for (action, batchSuccessor) in batch:
+                        self._assertSameState(state.generateSuccessor(agentIndex, action),
+                                batchSuccessor)
+
+                    state = state.generateSuccessor(agentIndex, rng.choice(actions))
+                    agentIndex = (agentIndex + 1) % state.getNumAgents()
+
+    def test_apply_action_in_place(self):
+        for state in self._initialStates():
+            original = state._initSuccessor()
+            action = state.getLegalActions(0)[0]
+
+            # The first action copies what the state shares, later ones reuse the copies.
+            state.applyAction(0, action)
+            state.undo()
+
+            agentStates = list(state.getAgentStates())
+            food = state._food
+
+            state.applyAction(0, action)
+            for (agentState, otherAgentState) in zip(agentStates, state.getAgentStates()):
+                self.assertIs(agentState, otherAgentState)
+
+            state.undo()
+            self.assertIs(food, state._food)
+            self._assertSameState(original, state)
+
+            # A failed action leaves the state as it was.
+            self.assertRaises(ValueError, state.applyAction, 0, 'NotAnAction')
+            self._assertSameState(original, state)
+            self.assertRaises(RuntimeError, state.undo)
+
+if __name__ == '__main__':
+    unittest.main()
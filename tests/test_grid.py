@@ -0,0 +1,88 @@
+import unittest
+
+from pacai.core.grid import BitGrid
+from pacai.core.grid import Grid
+from pacai.core.grid import GridView
+
+"""
+Test the grid containers.
+"""
+class GridTest(unittest.TestCase):
+    def _buildGrids(self):
+        width = 7
+        height = 5
+        cells = [(0, 0), (1, 4), (3, 2), (6, 4), (6, 0)]
+
+        grid = Grid(width, height)
+        bitGrid = BitGrid(width, height)
+        for (x, y) in cells:
+            grid[x][y] = True
+            bitGrid[x][y] = True
+
+        return grid, bitGrid, cells
+
+    def test_bitgrid_matches_grid(self):
+        grid, bitGrid, cells = self._buildGrids()
+
+        self.assertEqual(grid.count(), bitGrid.count())
+        self.assertEqual(grid.count(False), bitGrid.count(False))
+        self.assertEqual(sorted(grid.asList()), sorted(bitGrid.asList()))
+        self.assertEqual(sorted(grid.asList(False)), sorted(bitGrid.asList(False)))
+        self.assertEqual(hash(grid), hash(bitGrid))
+        self.assertEqual(str(grid), str(bitGrid))
+
+        for x in range(grid.getWidth()):
+            for y in range(grid.getHeight()):
+                self.assertEqual(grid[x][y], bitGrid[x][y])
+
+        self.assertEqual(bitGrid, BitGrid.fromGrid(grid))
+
+    def test_bitgrid_copy(self):
+        _, bitGrid, cells = self._buildGrids()
+
+        other = bitGrid.copy()
+        self.assertEqual(bitGrid, other)
+        self.assertEqual(hash(bitGrid), hash(other))
+
+        x, y = cells[0]
+        other[x][y] = False
+
+        self.assertTrue(bitGrid[x][y])
+        self.assertFalse(other[x][y])
+        self.assertNotEqual(bitGrid, other)
+        self.assertEqual(len(cells) - 1, other.count())
+
+    def test_view(self):
+        grid, bitGrid, cells = self._buildGrids()
+
+        for baseGrid in [grid, bitGrid]:
+            view = GridView(baseGrid)
+            x, y = cells[0]
+
+            self.assertTrue(view[x][y])
+            self.assertTrue(view.get(x, y))
+            self.assertEqual(baseGrid.get(x, y), view.get(x, y))
+            self.assertIs(view[x], view[x])
+            self.assertEqual(sorted(cells), sorted(view.asList()))
+            self.assertIs(view.asSharedList(), view.asSharedList())
+
+            # Callers get their own copy of the list.
+            cellList = view.asList()
+            cellList.clear()
+            self.assertEqual(sorted(cells), sorted(view.asList()))
+            self.assertEqual(len(cells), view.count())
+            self.assertEqual(baseGrid, view)
+
+            with self.assertRaises(TypeError):
+                view[x][y] = False
+
+            with self.assertRaises(TypeError):
+                view[x] = [False] * baseGrid.getHeight()
+
+            # Copies are regular grids that can be modified.
+            other = view.copy()
+            other[x][y] = False
+            self.assertTrue(view[x][y])
+
+if __name__ == '__main__':
+    unittest.main()
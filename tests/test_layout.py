@@ -0,0 +1,71 @@
+import unittest
+
+from pacai.core.actions import Actions
+from pacai.core.directions import Directions
+from pacai.core.distanceCalculator import computeDistances
+from pacai.core.layout import getLayout
+
+LAYOUTS = ['mediumClassic', 'defaultCapture', 'bigMaze']
+
+"""
+Test the precomputed information in layouts.
+"""
+class LayoutTest(unittest.TestCase):
+    def test_move_tables(self):
+        for name in LAYOUTS:
+            layout = getLayout(name)
+            walls = layout.walls
+
+            for position in walls.asList(False):
+                for direction in [Directions.NORTH, Directions.EAST, Directions.STOP]:
+                    self.assertEqual(Actions.getPossibleActions(position, direction, walls),
+                            layout.getPossibleActions(position, direction))
+
+                self.assertEqual(Actions.getLegalNeighbors(position, walls),
+                        layout.getLegalNeighbors(position))
+
+            # Positions between cells are not in the tables.
+            x, y = walls.asList(False)[0]
+            position = (x + 0.5, y)
+
+            self.assertEqual(Actions.getPossibleActions(position, Directions.EAST, walls),
+                    layout.getPossibleActions(position, Directions.EAST))
+            self.assertEqual(Actions.getLegalNeighbors(position, walls),
+                    layout.getLegalNeighbors(position))
+
+    def test_junction_graph(self):
+        for name in LAYOUTS:
+            layout = getLayout(name)
+            walls = layout.walls
+            graph = layout.getJunctionGraph()
+            distances = computeDistances(layout)
+
+            cells = walls.asList(False)
+            self.assertLess(graph.getNumNodes(), len(cells))
+
+            for cell in cells:
+                # Every cell is either a node or on an edge.
+                if (graph.getNodeId(cell) is not None):
+                    self.assertIsNone(graph.getEdgePosition(cell))
+                    continue
+
+                edgeId, offset = graph.getEdgePosition(cell)
+                self.assertEqual(cell, graph.getEdge(edgeId).getCell(offset))
+
+            for source in cells[::11]:
+                for target in cells[::7]:
+                    distance = distances.getDistance(source, target)
+                    self.assertEqual(distance, graph.getDistance(source, target))
+
+                    path = graph.getPath(source, target)
+                    self.assertEqual(distance, len(path))
+
+                    position = source
+                    for action in path:
+                        position = Actions.getSuccessor(position, action)
+                        self.assertFalse(walls[int(position[0])][int(position[1])])
+
+                    self.assertEqual(target, position)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+import unittest
+
+from pacai.agents.search.base import SearchAgent
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.actions import Actions
+from pacai.core.directions import Directions
+from pacai.core.distanceCalculator import computeDistances
+from pacai.core.layout import getLayout
+from pacai.core.search import anytime
+from pacai.core.search import bidirectional
+from pacai.core.search import engine
+from pacai.core.search import heuristic
+from pacai.core.search import jumpPoint
+from pacai.core.search import memoryBounded
+from pacai.core.search.food import FoodSearchProblem
+from pacai.core.search.food import PackedFoodSearchProblem
+from pacai.core.search.position import PositionSearchProblem
+from pacai.student.searchAgents import AnyFoodSearchProblem
+from pacai.student.searchAgents import CornersProblem
+
+LAYOUT = 'mediumMaze'
+
+"""
+Test the shared search engine.
+"""
+class SearchTest(unittest.TestCase):
+    def setUp(self):
+        self.layout = getLayout(LAYOUT)
+        self.state = PacmanGameState(self.layout)
+        self.distances = computeDistances(self.layout)
+
+    def _problem(self):
+        return PositionSearchProblem(self.state)
+
+    def _checkPath(self, problem, actions):
+        self.assertIsNotNone(actions)
+
+        position = problem.startingState()
+        for action in actions:
+            x, y = Actions.getSuccessor(position, action)
+            position = (int(x), int(y))
+            self.assertFalse(self.layout.isWall(position))
+
+        self.assertEqual(problem.goal, position)
+
+    def test_searches(self):
+        optimal = self.distances.getDistance(self._problem().startingState(), self._problem().goal)
+
+        searches = [
+            (engine.breadthFirstSearch, True),
+            (engine.uniformCostSearch, True),
+            (lambda problem: engine.aStarSearch(problem, heuristic.manhattan), True),
+            (bidirectional.bidirectionalUniformCostSearch, True),
+            (lambda problem: bidirectional.bidirectionalAStarSearch(problem, heuristic.manhattan),
+                True),
+            (lambda problem: memoryBounded.iterativeDeepeningAStarSearch(problem,
+                heuristic.manhattan), True),
+            (lambda problem: memoryBounded.memoryBoundedAStarSearch(problem, heuristic.manhattan),
+                True),
+            (jumpPoint.jumpPointSearch, True),
+            (lambda problem: anytime.anytimeAStarSearch(problem, heuristic.manhattan,
+                timeLimit = None), True),
+            (engine.depthFirstSearch, False),
+            (lambda problem: engine.greedySearch(problem, heuristic.manhattan), False),
+        ]
+
+        for (search, isOptimal) in searches:
+            problem = self._problem()
+            actions = search(problem)
+
+            self._checkPath(problem, actions)
+            if (isOptimal):
+                self.assertEqual(optimal, len(actions))
+
+    def test_node_budget(self):
+        self.assertIsNone(engine.uniformCostSearch(self._problem(), maxNodes = 10))
+
+        problem = self._problem()
+        self._checkPath(problem, engine.uniformCostSearch(problem, maxNodes = 10000))
+
+    def test_bidirectional(self):
+        # Weighted moves, where the cheapest path is not the shortest one.
+        costFn = lambda position: 2 ** position[0]
+
+        cells = self.layout.walls.asList(False)
+        for (start, goal) in zip(cells[::7], cells[::-11]):
+            expected = PositionSearchProblem(self.state, costFn, goal, start)
+            expected = expected.actionsCost(engine.uniformCostSearch(expected))
+
+            problem = PositionSearchProblem(self.state, costFn, goal, start)
+            actions = bidirectional.bidirectionalUniformCostSearch(problem)
+            self.assertEqual(expected, problem.actionsCost(actions))
+
+        # Searching backwards from every food at once finds the closest one.
+        state = PacmanGameState(getLayout('trickySearch'))
+        problem = AnyFoodSearchProblem(state)
+        actions = bidirectional.bidirectionalUniformCostSearch(problem)
+        self.assertEqual(len(engine.breadthFirstSearch(AnyFoodSearchProblem(state))),
+                problem.actionsCost(actions))
+
+        # Problems that can not search backwards.
+        problem = PositionSearchProblem(self.state, goal = None)
+        self.assertRaises(ValueError, bidirectional.bidirectionalUniformCostSearch, problem)
+
+        for problem in [FoodSearchProblem(self.state), CornersProblem(self.state)]:
+            self.assertRaises(ValueError, bidirectional.bidirectionalUniformCostSearch, problem)
+            self.assertRaises(ValueError, bidirectional.bidirectionalAStarSearch, problem)
+
+    def test_memory_bounded(self):
+        optimal = len(engine.breadthFirstSearch(self._problem()))
+
+        # The transposition table and memory only limit how much is remembered.
+        actions = memoryBounded.iterativeDeepeningAStarSearch(self._problem(), maxMemory = 10)
+        self.assertEqual(optimal, len(actions))
+
+        actions = memoryBounded.memoryBoundedAStarSearch(self._problem(), heuristic.manhattan,
+                maxMemory = optimal + 10)
+        self.assertEqual(optimal, len(actions))
+
+        # The path does not fit in memory.
+        self.assertIsNone(memoryBounded.memoryBoundedAStarSearch(self._problem(),
+                heuristic.manhattan, maxMemory = optimal))
+
+        state = PacmanGameState(getLayout('trickySearch'))
+        optimal = len(engine.aStarSearch(FoodSearchProblem(state), heuristic.foodMST))
+
+        for search in [memoryBounded.idastar, memoryBounded.smastar]:
+            problem = PackedFoodSearchProblem(state)
+            actions = search(problem, heuristic.foodMST, maxMemory = 1000)
+            self.assertEqual(optimal, problem.actionsCost(actions))
+
+    def test_jump_point(self):
+        layout = getLayout('openMaze')
+        state = PacmanGameState(layout)
+        distances = computeDistances(layout)
+
+        cells = layout.walls.asList(False)
+        for (start, goal) in zip(cells[::13], cells[::-17]):
+            problem = PositionSearchProblem(state, goal = goal, start = start)
+            actions = jumpPoint.jumpPointSearch(problem)
+            self.assertEqual(distances.getDistance(start, goal), problem.actionsCost(actions))
+
+        problem = PositionSearchProblem(self.state, costFn = lambda position: 2)
+        self.assertRaises(ValueError, jumpPoint.jumpPointSearch, problem)
+
+    def test_search_agent_limits(self):
+        # Out of nodes, the agent has no path and stops.
+        agent = SearchAgent(0, fn = 'pacai.core.search.engine.bfs', maxNodes = 5)
+        agent.registerInitialState(self.state)
+        self.assertEqual(Directions.STOP, agent.getAction(self.state))
+
+        agent = SearchAgent(0, fn = 'pacai.core.search.engine.bfs', maxNodes = 100000)
+        agent.registerInitialState(self.state)
+        self.assertNotEqual(Directions.STOP, agent.getAction(self.state))
+
+        # Out of time, the same happens for an anytime search.
+        fn = 'pacai.core.search.anytime.anytimeAStarSearch'
+        heuristic = 'pacai.core.search.heuristic.manhattan'
+        agent = SearchAgent(0, fn = fn, heuristic = heuristic, timeLimit = 0)
+        agent.registerInitialState(self.state)
+        self.assertEqual(Directions.STOP, agent.getAction(self.state))
+
+        agent = SearchAgent(0, fn = fn, heuristic = heuristic, timeLimit = 60)
+        agent.registerInitialState(self.state)
+        self.assertNotEqual(Directions.STOP, agent.getAction(self.state))
+
+    def test_anytime(self):
+        # Out of time before any path is found.
+        self.assertIsNone(anytime.anytimeAStarSearch(self._problem(), heuristic.manhattan,
+                timeLimit = 0))
+
+        state = PacmanGameState(getLayout('trickySearch'))
+        optimal = len(engine.aStarSearch(FoodSearchProblem(state), heuristic.foodMST))
+
+        # A large weight gives a path right away, and it improves to the optimal one.
+        problem = PackedFoodSearchProblem(state)
+        actions = anytime.anytimeAStarSearch(problem, heuristic.foodMST, timeLimit = 60,
+                weight = 10)
+        self.assertEqual(optimal, problem.actionsCost(actions))
+
+    def test_packed_food(self):
+        state = PacmanGameState(getLayout('trickySearch'))
+
+        gridProblem = FoodSearchProblem(state)
+        packedProblem = PackedFoodSearchProblem(state)
+
+        self.assertEqual(heuristic.numFood(gridProblem.startingState(), gridProblem),
+                heuristic.numFood(packedProblem.startingState(), packedProblem))
+        self.assertEqual(gridProblem.startingState()[1].asList(),
+                packedProblem.getFoodPositions(packedProblem.startingState()[1]))
+
+        gridActions = engine.aStarSearch(gridProblem, heuristic.numFood)
+        packedActions = engine.aStarSearch(packedProblem, heuristic.numFood)
+
+        self.assertEqual(gridProblem.actionsCost(gridActions),
+                packedProblem.actionsCost(packedActions))
+
+    def test_food_mst(self):
+        state = PacmanGameState(getLayout('trickySearch'))
+
+        gridProblem = FoodSearchProblem(state)
+        packedProblem = PackedFoodSearchProblem(state)
+        optimal = len(engine.uniformCostSearch(FoodSearchProblem(state)))
+
+        self.assertLessEqual(heuristic.foodMST(gridProblem.startingState(), gridProblem), optimal)
+        self.assertEqual(heuristic.foodMST(gridProblem.startingState(), gridProblem),
+                heuristic.foodMST(packedProblem.startingState(), packedProblem))
+
+        for problem in [gridProblem, packedProblem]:
+            actions = engine.aStarSearch(problem, heuristic.foodMST)
+            self.assertEqual(optimal, problem.actionsCost(actions))
+
+        # Food from a game state (a Grid or a GridView) works the same as a BitGrid.
+        position, food = gridProblem.startingState()
+        expected = heuristic.foodMST((position, food), gridProblem)
+        for otherFood in [state.getFood(), state.getFoodView()]:
+            self.assertEqual(expected, heuristic.foodMST((position, otherFood), gridProblem))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -52,5 +52,44 @@ class UtilContainersTest(unittest.TestCase):
         for val, pri in reversed(val_list):
             self.assertEqual(val, testPriorityQueue.pop())
 
+    def test_indexed_priority_queue(self):
+        testQueue = priorityQueue.IndexedPriorityQueue()
+        self.assertTrue(testQueue.isEmpty())
+
+        # Items that can not be compared to each other (object() has no ordering),
+        # all with the same priority.
+        keys = [object() for x in range(10)]
+        self.assertRaises(TypeError, lambda: keys[0] < keys[1])
+
+        for key in keys:
+            testQueue.push(key, 5)
+
+        self.assertEqual(len(keys), len(testQueue))
+        self.assertTrue(testQueue.contains(keys[3]))
+        self.assertRaises(ValueError, testQueue.push, keys[3], 1)
+
+        testQueue.decreaseKey(keys[7], 1)
+        self.assertRaises(ValueError, testQueue.decreaseKey, keys[7], 2)
+
+        self.assertTrue(testQueue.update(keys[9], 3))
+        self.assertFalse(testQueue.update(keys[9], 4))
+        newKey = object()
+        self.assertTrue(testQueue.update(newKey, 4))
+
+        # Tied with newKey, but pushed first.
+        testQueue.decreaseKey(keys[8], 4)
+
+        self.assertEqual(5, testQueue.remove(keys[0]))
+        self.assertRaises(KeyError, testQueue.remove, keys[0])
+        testQueue.push(keys[0], 5)
+
+        # Lowest priority first, and equal priorities in the order they were pushed.
+        expected = [keys[7], keys[9], keys[8], newKey] + keys[1:7] + [keys[0]]
+        for key in expected:
+            self.assertIs(key, testQueue.pop())
+
+        self.assertTrue(testQueue.isEmpty())
+        self.assertFalse(testQueue.contains(keys[0]))
+
 if __name__ == '__main__':
     unittest.main()